@@ -6,16 +6,42 @@
 import os
 import pygame
 import sys
+import time
 from src.utils import KeyTracker, resource_path
+from src.assets import AssetManager
 from src.core.system import System
 from src.core.field import Field
 from src.core.talk import Talk
 from src.core.visual_novel import VisualNovel
-from src.ui import draw_objective_bar
+from src.ui import draw_objective_bar, render_text, translucent_surface, IrisMask
 
 # --- ウィンドウ設定 ---
 WIDTH, HEIGHT = 900, 700
-FPS = 60
+FPS = 60  # 描画の上限フレームレート（下げてもゲームの進行速度は変わらない）
+TICK_RATE = 60  # ゲーム進行の更新回数/秒（移動速度や待ち時間はこの単位で数える）
+TICK_MS = 1000 / TICK_RATE
+MAX_TICKS_PER_FRAME = 5  # 1フレームで追いつく更新回数の上限（超えた遅れは切り捨て）
+DIRTY_RECTS = True  # 変化した領域のみ画面に反映する（False で毎フレーム全体を flip）
+IDLE_PACING = True  # 入力待ちの間はイベントが来るまでループを止める
+IDLE_TIMEOUT_MS = 500  # 入力待ち中でもこの間隔で1フレーム進める
+
+# --- HUD（画面左上のUI）---
+HELP_LINES = [
+    "↑/↓/←/→ : 移動",
+    "Z : 話しかける / 決定",
+    "Q : 会話を終了",
+    "I : インベントリ",
+    "M : マップを開く",
+]
+HUD_HEIGHT = 88 + len(HELP_LINES) * 18
+
+# --- サブシステム ---
+# 初回アクセス時に生成する（タイトル表示後は1フレームに1つずつ、この順に準備する）
+SUBSYSTEMS = {
+    "talk": Talk,
+    "vn": VisualNovel,
+    "field": Field,
+}
 
 # --- シーン定義 ---
 SCENE_TITLE = 0
@@ -25,13 +51,23 @@ SCENE_VN = 2
 
 class App:
     def __init__(self):
+        # 起動時間の計測（フェーズ名 -> ms）
+        self.startup_timings = {}
+        self._startup_t0 = time.perf_counter()
+        self._startup_mark = self._startup_t0
+
         # pre_init は pygame.init() より前に呼ぶ
         pygame.mixer.pre_init(44100, -16, 2, 512)
         pygame.init()
-        # 既に pygame.init() で mixer が初期化されている場合があるため確認
+        # main.init_audio() で初期化済みの場合があるため、未初期化の時のみ行う
         if not pygame.mixer.get_init():
-            pygame.mixer.init()
+            try:
+                pygame.mixer.init()
+            except pygame.error as e:
+                print(f"App: Mixer initialization failed - {e}")
         print("Mixer init status:", pygame.mixer.get_init())
+        self._mark_startup("pygame_init")
+
         # 0. 基礎変数を「最初」に定義する（AttributeError防止）
         self.running = True
         self.scene_state = SCENE_TITLE
@@ -44,17 +80,18 @@ class App:
         self._prev_item_count = 0
         self.stop_map_transition = None  # ノベル終了後のマップ遷移用
         self.played_events = set()  # 実行済みイベントIDを管理
-
-        # Mixer 初期化
-        try:
-            pygame.mixer.pre_init(44100, -16, 2, 512)
-            pygame.mixer.init()
-            print("App: Mixer initialized successfully with directsound.")
-        except Exception as e:
-            print(f"App: Mixer initialization failed - {e}")
+        self._prev_view_state = None  # 前回描画時の画面状態（差分描画用）
+        self._force_redraw = True  # 次フレームで全体を描き直すか
+        self._hud_layer = None  # HUD描画済みレイヤー
+        self._hud_key = None  # HUDの入力（アイテム・マップ・座標）
+        self._tick_accumulator = 0.0  # まだ更新に使っていない経過時間（ms）
+        self.render_alpha = 0.0  # 前回の更新から次の更新までの進み具合（補間描画用）
+        self._subsystems = {}  # 生成済みサブシステム（名前 -> インスタンス）
+        self._init_queue = list(SUBSYSTEMS)  # メインループで準備するサブシステム
 
         # 2. 基本システム
         self.BASE_DIR = resource_path("assets")
+        self.assets = AssetManager(self.BASE_DIR)  # 画像の共有キャッシュ
         self.system = System(self)
         self.key_tracker = KeyTracker()
 
@@ -64,15 +101,73 @@ class App:
             "THE JOURNEY TO ROCKET LAUNCH ~YOU CAN (NOT) TRY AGAIN~"
         )
         self.clock = pygame.time.Clock()
+        # アイリス遷移用マスク（Field の遷移と iris_* 状態で共用）
+        self.iris_mask = IrisMask((WIDTH, HEIGHT))
+        self._mark_startup("display")
 
         # 4. リソースロード
         self._load_resources()
-
-        # 5. サブシステム（BGMを鳴らそうとする可能性があるもの）
-        # ここで内部的にBGM再生が呼ばれても良いように、最後に配置
-        self.field = Field(self)
-        self.talk = Talk(self)
-        self.vn = VisualNovel(self)
+        self._mark_startup("resources")
+
+        # 5. サブシステム（Field / Talk / VisualNovel）は初回アクセス時に生成する
+        # run() ではタイトル画面を表示してから、メインループで1フレームに1つずつ準備する
+        # （Surface の変換やミキサーの操作を含むため、別スレッドでは生成しない）
+
+    # --- サブシステム（遅延生成） ---
+
+    @property
+    def field(self):
+        return self._subsystem("field")
+
+    @property
+    def talk(self):
+        return self._subsystem("talk")
+
+    @property
+    def vn(self):
+        return self._subsystem("vn")
+
+    def _subsystem(self, name):
+        """サブシステムを返す。未生成ならここで生成する（メインスレッドから呼ぶこと）"""
+        obj = self._subsystems.get(name)
+        if obj is None:
+            t0 = time.perf_counter()
+            obj = SUBSYSTEMS[name](self)
+            self._subsystems[name] = obj
+            self.startup_timings[name] = (time.perf_counter() - t0) * 1000
+        return obj
+
+    def _init_next_subsystem(self):
+        """未生成のサブシステムを1つだけ生成する（メインループから毎フレーム呼ぶ）"""
+        name = self._init_queue.pop(0)
+        try:
+            self._subsystem(name)
+        except Exception as e:
+            # 失敗した場合は初回アクセス時に再度生成する
+            print(f"App: Deferred Init Error ({name}) - {e}")
+        if not self._init_queue:
+            self._print_startup_report()
+
+    # --- 起動時間の計測 ---
+
+    def _mark_startup(self, phase):
+        """前回の記録からの経過時間を phase の所要時間として記録する"""
+        now = time.perf_counter()
+        self.startup_timings[phase] = (now - self._startup_mark) * 1000
+        self._startup_mark = now
+
+    def _print_startup_report(self):
+        """起動時間の内訳を表示する"""
+        t = self.startup_timings
+        main_phases = ("pygame_init", "display", "resources", "first_frame")
+        deferred = [name for name in SUBSYSTEMS if name in t]
+        print(
+            "App: Startup (ms) - "
+            + " / ".join(f"{p} {t[p]:.1f}" for p in main_phases if p in t)
+            + f" (title shown at {t.get('title_shown', 0.0):.1f})"
+            + " | deferred "
+            + " / ".join(f"{name} {t[name]:.1f}" for name in deferred)
+        )
 
     def _load_resources(self):
         """フォントやタイトル画像などの静的リソースをロード"""
@@ -91,10 +186,10 @@ class App:
             self.title_font = pygame.font.SysFont("meiryo", 32)
             self.prompt_font = pygame.font.SysFont("meiryo", 20)
 
-        #  タイトル画像
+        #  タイトル画像（コンパイル済みがあればデコードせずに読み込む）
         img_p = resource_path(os.path.join(self.BASE_DIR, "img", "story", "title.jpg"))
         self.title_image = (
-            pygame.image.load(img_p).convert() if os.path.isfile(img_p) else None
+            self.assets.image("story/title.jpg") if os.path.isfile(img_p) else None
         )
 
         # 効果音
@@ -135,18 +230,145 @@ class App:
 
     def run(self):
         """ゲームのメインループ"""
+        # まずタイトル画面を表示し、その間にサブシステムを準備する
+        self._run_frame(0)
+        self._mark_startup("first_frame")
+        self.startup_timings["title_shown"] = (
+            time.perf_counter() - self._startup_t0
+        ) * 1000
+
         while self.running:
-            self.clock.tick(FPS)
+            if self._init_queue:
+                self._init_next_subsystem()
+            if IDLE_PACING and self._is_idle():
+                self._wait_for_input(self._idle_timeout_ms())
+                self.clock.tick()  # 待機分を次フレームの間隔に含めない
+                elapsed = TICK_MS  # 待機明けは1回だけ更新する
+            else:
+                elapsed = self.clock.tick(FPS)
+            self._run_frame(elapsed)
+
+        pygame.quit()
+        sys.exit()
 
-            events = pygame.event.get()
-            self._handle_events(events)
+    def _run_frame(self, elapsed_ms=TICK_MS):
+        """
+        1フレーム分のイベント処理・更新・描画・画面反映。
+        更新は経過時間 elapsed_ms に応じた回数（固定間隔の tick 単位）だけ行う
+        """
+        events = pygame.event.get()
+        self._handle_events(events)
+        self.system.bgm.update()  # デコードを待っていた BGM の再生開始
+        for _ in range(self._consume_ticks(elapsed_ms)):
             self._update()
+
+        if not DIRTY_RECTS:
             self._draw()
+            pygame.display.flip()
+            return
 
+        dirty = self._collect_dirty_rects()
+        if not dirty:
+            return  # 変化がなければ描画も画面反映も行わない
+
+        self._draw()
+        if dirty[0] == self.screen.get_rect():
             pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+
+    def _consume_ticks(self, elapsed_ms):
+        """経過時間を蓄積し、今回のフレームで行う更新回数を返す"""
+        self._tick_accumulator += elapsed_ms
+        ticks = int(self._tick_accumulator // TICK_MS)
+        if ticks > MAX_TICKS_PER_FRAME:
+            # 追いつけないほど遅れた分は捨てる（処理落ち時はゆっくり進む）
+            ticks = MAX_TICKS_PER_FRAME
+            self._tick_accumulator = 0.0
+        else:
+            self._tick_accumulator -= ticks * TICK_MS
+        self.render_alpha = self._tick_accumulator / TICK_MS
+        return ticks
 
-        pygame.quit()
-        sys.exit()
+    # --- 入力待ち時のフレーム制御 ---
+
+    def _is_idle(self):
+        """アニメーションがなく、入力を待つだけの状態か"""
+        if self._init_queue:
+            return False  # サブシステムの準備中は待機しない
+        if self.system.bgm.is_waiting():
+            return False  # デコード完了後の BGM の再生開始を遅らせない
+
+        # キーを押し続けている間は毎フレーム処理する（移動の継続など）
+        pressed = pygame.key.get_pressed()
+        if any(pressed[k] for k in KeyTracker.TRACKED_KEYS.values()):
+            return False
+
+        if self.scene_state == SCENE_TITLE:
+            return True
+        if self.scene_state == SCENE_VN:
+            return self.vn.active
+        return not self.field.is_animating() and self.talk.wait_frames == 0
+
+    def _idle_timeout_ms(self):
+        """入力待ちを打ち切るまでの時間（タイトルは点滅の切り替わりまで）"""
+        if self.scene_state == SCENE_TITLE:
+            return 500 - pygame.time.get_ticks() % 500
+        return IDLE_TIMEOUT_MS
+
+    def _wait_for_input(self, timeout_ms):
+        """イベントが来るか timeout_ms 経過するまで待機する"""
+        ev = pygame.event.wait(timeout_ms)
+        if ev.type != pygame.NOEVENT:
+            # 次フレームの pygame.event.get() で処理されるよう戻す
+            pygame.event.post(ev)
+
+    # --- 差分描画 ---
+
+    def mark_dirty(self):
+        """次のフレームで画面全体を描き直す"""
+        self._force_redraw = True
+
+    def _view_state(self):
+        """
+        現在のシーンの見た目を決める状態を返す。
+        アニメーション中など毎フレーム描き直す必要がある場合は None
+        """
+        if self.scene_state == SCENE_TITLE:
+            return (SCENE_TITLE, self._title_prompt_visible())
+
+        if self.scene_state == SCENE_VN:
+            return (SCENE_VN, self.vn.view_state())
+
+        if self.field.is_animating():
+            return None
+        return (
+            SCENE_GAME,
+            self.x,
+            self.y,
+            self.field.view_state(),
+            self.inventory_open,
+            tuple(self.items),
+            self.talk.view_state(),
+        )
+
+    def _collect_dirty_rects(self):
+        """前回描画時から変化した領域のリストを返す（全体なら画面矩形のみ）"""
+        state = self._view_state()
+        prev = self._prev_view_state
+        self._prev_view_state = state
+        full = [self.screen.get_rect()]
+
+        if self._force_redraw or state is None:
+            self._force_redraw = False
+            return full
+        if state == prev:
+            return []
+
+        # タイトル画面はプロンプトの点滅のみが変化する
+        if prev and state[0] == prev[0] == SCENE_TITLE:
+            return [self._title_prompt_rect()]
+        return full
 
     # --- イベント・更新処理 ---
 
@@ -157,6 +379,9 @@ class App:
                 ev.type == pygame.KEYDOWN and ev.key == pygame.K_ESCAPE
             ):
                 self.running = False
+            elif ev.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # ウィンドウが再表示された場合は全体を描き直す
+                self.mark_dirty()
 
         if self.scene_state == SCENE_TITLE:
             if any(ev.type == pygame.MOUSEBUTTONDOWN for ev in events):
@@ -190,9 +415,15 @@ class App:
                 pass
 
     def _update(self):
-        """データ更新の振り分け"""
+        """データ更新の振り分け（1 tick 分）"""
         keys = self.key_tracker.update()
 
+        # タイトル画面ではゲーム本編を進めない
+        if self.scene_state == SCENE_TITLE:
+            return
+
+        self.field.begin_tick()
+
         if self.scene_state == SCENE_GAME:
             self.talk.update(keys)
 
@@ -225,32 +456,63 @@ class App:
                 self.title_image,
                 self.title_image.get_rect(center=(WIDTH // 2, HEIGHT // 2)),
             )
-            t_surf1 = self.title_font.render(
-                "THE JOURNEY TO ROCKET LAUNCH", True, (255, 255, 150)
+            t_surf1 = render_text(
+                self.title_font, "THE JOURNEY TO ROCKET LAUNCH", (255, 255, 150)
             )
             self.screen.blit(
                 t_surf1, t_surf1.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
             )
-            t_surf2 = self.title_font.render(
-                "~YOU CAN (NOT) TRY AGAIN~", True, (255, 255, 150)
+            t_surf2 = render_text(
+                self.title_font, "~YOU CAN (NOT) TRY AGAIN~", (255, 255, 150)
             )
             self.screen.blit(
                 t_surf2, t_surf2.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 10))
             )
 
         # 点滅するプロンプト
-        if pygame.time.get_ticks() % 1000 < 500:
-            p_surf = self.prompt_font.render("CLICK TO START", True, (255, 255, 200))
-            self.screen.blit(p_surf, p_surf.get_rect(center=(WIDTH // 2, HEIGHT - 80)))
+        if self._title_prompt_visible():
+            self.screen.blit(self._title_prompt_surface(), self._title_prompt_rect())
+
+    def _title_prompt_visible(self):
+        """タイトルのプロンプトを表示するタイミングか（0.5秒毎に点滅）"""
+        return pygame.time.get_ticks() % 1000 < 500
+
+    def _title_prompt_surface(self):
+        return render_text(self.prompt_font, "CLICK TO START", (255, 255, 200))
+
+    def _title_prompt_rect(self):
+        return self._title_prompt_surface().get_rect(center=(WIDTH // 2, HEIGHT - 80))
 
     def _draw_game(self):
         """RPGパートの描画"""
         self.screen.fill((50, 50, 80))
         self.field.draw(self.screen)
 
+        # UI: 目的バー・アイテム・座標・操作ガイド（キャッシュしたレイヤーを1回で描画）
+        self.screen.blit(self._get_hud_layer(), (0, 0))
+
+        # 会話ウィンドウ
+        self.talk.draw(self.screen, self.font)
+
+        # インベントリ・オーバーレイ
+        if self.inventory_open:
+            self._draw_inventory()
+
+    def _get_hud_layer(self):
+        """HUDレイヤーを返す。アイテム・マップ・座標が変わった時のみ作り直す"""
+        key = (tuple(self.items), self.field.current_map_id, self.x, self.y)
+        if key == self._hud_key:
+            return self._hud_layer
+
+        # レイヤーは使い回し、透明で塗り直してから描く
+        if self._hud_layer is None:
+            self._hud_layer = pygame.Surface((WIDTH, HUD_HEIGHT), pygame.SRCALPHA)
+        layer = self._hud_layer
+        layer.fill((0, 0, 0, 0))
+
         # UI: 目的バー
         draw_objective_bar(
-            self.screen,
+            layer,
             self.font,
             self.system.get_current_objective(),
             rect=(0, 0, WIDTH, 32),
@@ -258,37 +520,22 @@ class App:
 
         # UI: アイテムリスト
         i_text = f"ITEMS: {', '.join(self.items)}" if self.items else "ITEMS: -"
-        self.screen.blit(self.font.render(i_text, True, (255, 255, 255)), (8, 40))
+        layer.blit(render_text(self.font, i_text, (255, 255, 255)), (8, 40))
 
         # UI: 座標表示
         pos_text = f"POS: ({self.x}, {self.y})"
-        self.screen.blit(self.font.render(pos_text, True, (255, 255, 255)), (8, 64))
+        layer.blit(render_text(self.font, pos_text, (255, 255, 255)), (8, 64))
 
         # UI: 操作ガイド
-        h_lines = [
-            "↑/↓/←/→ : 移動",
-            "Z : 話しかける / 決定",
-            "Q : 会話を終了",
-            "I : インベントリ",
-            "M : マップを開く",
-        ]
-        for i, text in enumerate(h_lines):
-            self.screen.blit(
-                self.font.render(text, True, (220, 220, 220)), (8, 88 + i * 18)
-            )
-
-        # 会話ウィンドウ
-        self.talk.draw(self.screen, self.font)
+        for i, text in enumerate(HELP_LINES):
+            layer.blit(render_text(self.font, text, (220, 220, 220)), (8, 88 + i * 18))
 
-        # インベントリ・オーバーレイ
-        if self.inventory_open:
-            self._draw_inventory()
+        self._hud_key = key
+        return layer
 
     def _draw_inventory(self):
         """インベントリ画面のオーバーレイ描画"""
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(translucent_surface((WIDTH, HEIGHT), (0, 0, 0, 150)), (0, 0))
 
         # ウィンドウ本体
         bx, by = (WIDTH - 480) // 2, (HEIGHT - 360) // 2
@@ -297,11 +544,11 @@ class App:
 
         # テキスト描画
         self.screen.blit(
-            self.title_font.render("INVENTORY (I to close)", True, (255, 255, 255)),
+            render_text(self.title_font, "INVENTORY (I to close)", (255, 255, 255)),
             (bx + 12, by + 8),
         )
         for i, item in enumerate(self.items):
             self.screen.blit(
-                self.font.render(f"- {item}", True, (220, 220, 220)),
+                render_text(self.font, f"- {item}", (220, 220, 220)),
                 (bx + 16, by + 48 + i * 22),
             )
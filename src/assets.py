@@ -0,0 +1,143 @@
+"""
+アセット管理 | src/assets.py
+画像の読み込みを一元化し、画像名と変種（アルファ有無・拡縮サイズ）ごとに
+メモリ上限付きの LRU キャッシュで共有する。準備済みマップと拡大チャンクも同じ上限で保持する
+"""
+
+import threading
+import pygame
+from src.atlas import decode_sprite, finish_sprite
+from src.compiled_assets import decode_image, finish_image
+from src.utils import LRUCache, surface_nbytes
+
+# 画像・準備済みマップ・拡大チャンクで共有するメモリ上限（バイト）
+# これ以外のキャッシュは小さな固定上限のみ（文字描画 8MB・半透明サーフェス 16MB・
+# 行分割 1MB、BGM は bgm.BGM_CACHE_TRACKS 曲分のデコード済み音声）
+ASSET_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class AssetManager:
+    """
+    assets/img 以下の画像を読み込み、(画像名, アルファ有無, サイズ, 補間) ごとに
+    キャッシュするクラス。拡縮前の画像も同じキャッシュで共有する。
+    読み込みに失敗した画像は記録し、毎回読み込み直さない。
+    image() はメインスレッドから呼ぶ。prefetch() はどのスレッドからでも呼べ、
+    デコードだけを先に済ませておく（変換・拡縮は最初に image() で使うときに行う）。
+    get() / put() で画像以外のデータ（準備済みマップ・拡大チャンク）も同じ上限の下で保持する。
+    """
+
+    def __init__(self, base_dir, budget=ASSET_CACHE_BYTES):
+        self.base_dir = base_dir
+        self.cache = LRUCache(budget)
+        self._missing = set()  # 読み込みに失敗した画像名
+        self._pending = {}  # 先読み中のキー -> 完了通知用 Event
+        self._lock = threading.Lock()
+
+    def image(self, name, alpha=False, size=None, smooth=False):
+        """
+        画像を返す（共有されるため書き換えないこと）。読み込めない場合は None。
+        alpha: 透過付き（立ち絵・キャラクター）か、不透明（背景・マップ）か
+        size: 拡縮後のサイズ。smooth が True なら smoothscale で拡縮する
+        メインスレッドから呼ぶこと
+        """
+        if not name or name in self._missing:
+            return None
+        size = tuple(size) if size else None
+        key = ("image", name, alpha, size, smooth if size else False)
+
+        surf = self.get(key)
+        if surf is None:
+            surf = self._load(name, alpha, size, smooth)
+            if surf is not None:
+                self.put(key, surf, surface_nbytes(surf))
+        return surf
+
+    def _load(self, name, alpha, size, smooth):
+        """キャッシュにない画像を読み込む（拡縮は元画像をキャッシュ経由で取得して行う）"""
+        try:
+            if not alpha:
+                # 不透明画像はコンパイル済みの拡縮結果を使う
+                decoded = self._take_decoded(("decoded", name, alpha, size))
+                return finish_image(self.base_dir, name, size, decoded)
+            if size is None:
+                decoded = self._take_decoded(("decoded", name, alpha, None))
+                return finish_sprite(self.base_dir, name, decoded)
+        except (FileNotFoundError, pygame.error) as e:
+            print(f"AssetManager: Load Error ({name}) - {e}")
+            self._missing.add(name)
+            return None
+
+        base = self.image(name, alpha)
+        if base is None:
+            return None
+        scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        return scale(base, size)
+
+    def _take_decoded(self, key):
+        """先読み済みのデコード結果を取り出す（先読み中なら完了を待つ。なければ None）"""
+        with self._lock:
+            event = self._pending.get(key)
+        if event is not None:
+            event.wait()
+        return self.pop(key)
+
+    def prefetch(self, name, alpha=False, size=None):
+        """
+        画像のデコードだけを先に行っておく（どのスレッドからでも可）。
+        不透明画像は size のコンパイル済み拡縮結果（なければ元画像）を、
+        透過画像は拡縮前の画像をデコードする
+        """
+        if not name or name in self._missing:
+            return
+        size = tuple(size) if size and not alpha else None
+        key = ("decoded", name, alpha, size)
+        with self._lock:
+            if (
+                key in self.cache
+                or key in self._pending
+                or ("image", name, alpha, size, False) in self.cache
+            ):
+                return
+            self._pending[key] = threading.Event()
+
+        try:
+            if alpha:
+                decoded = decode_sprite(self.base_dir, name)
+                nbytes = surface_nbytes(decoded) if decoded is not None else 0
+            else:
+                decoded = decode_image(self.base_dir, name, size)
+                nbytes = surface_nbytes(decoded[0])
+            if decoded is not None:
+                self.put(key, decoded, nbytes)
+        except (FileNotFoundError, pygame.error) as e:
+            print(f"AssetManager: Load Error ({name}) - {e}")
+            self._missing.add(name)
+        finally:
+            with self._lock:
+                self._pending.pop(key).set()
+
+    def get(self, key):
+        """put() で登録したデータを返す（なければ None）。key は種類名から始まるタプル"""
+        with self._lock:
+            return self.cache.get(key)
+
+    def put(self, key, value, nbytes):
+        """データを nbytes バイトとして登録する（上限を超えた分は古い順に破棄される）"""
+        with self._lock:
+            self.cache.put(key, value, nbytes)
+
+    def pop(self, key):
+        """登録したデータを取り除いて返す（上限の計算からも外れる。なければ None）"""
+        with self._lock:
+            return self.cache.pop(key)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self.cache
+
+    def stats(self):
+        """キャッシュの使用状況を返す"""
+        with self._lock:
+            stats = self.cache.stats()
+        stats["missing"] = len(self._missing)
+        return stats
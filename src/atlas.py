@@ -0,0 +1,207 @@
+"""
+スプライトアトラス | src/atlas.py
+キャラクター画像を1枚のアトラス画像と矩形インデックス（JSON）にまとめるビルド処理と、
+実行時にアトラスから各スプライトを切り出して返す処理を提供
+
+    python -m src.atlas    # assets/img/character/*.png からアトラスを生成
+"""
+
+import json
+import os
+import sys
+import threading
+import pygame
+from src.utils import resource_path
+
+# --- 設定 ---
+ATLAS_SOURCE_DIR = "character"  # assets/img 以下の収録対象ディレクトリ
+ATLAS_IMAGE = "character_atlas.png"  # assets/img 以下に生成するアトラス画像
+ATLAS_INDEX = "character_atlas.json"  # 同じく矩形インデックス
+ATLAS_MAX_WIDTH = 1024  # アトラスの横幅の上限（px）
+ATLAS_PADDING = 1  # スプライト間の余白（px）
+
+
+def _pack(sizes, max_width, padding):
+    """
+    シェルフ詰めで各矩形の配置位置を決める。
+    sizes: 名前 -> (w, h)。返り値は (名前 -> (x, y), アトラスの幅, 高さ)
+    """
+    width = max([max_width] + [w for w, _ in sizes.values()])
+    positions = {}
+    x = y = shelf_h = 0
+    used_w = 0
+
+    # 背の高い順に並べると棚の隙間が小さくなる
+    for name in sorted(sizes, key=lambda n: (-sizes[n][1], n)):
+        w, h = sizes[name]
+        if x and x + w > width:
+            y += shelf_h + padding
+            x = shelf_h = 0
+        positions[name] = (x, y)
+        x += w + padding
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x - padding)
+
+    return positions, used_w, y + shelf_h
+
+
+def build_atlas(img_dir, source_dir=ATLAS_SOURCE_DIR):
+    """img_dir/source_dir 以下の PNG をまとめたアトラス画像とインデックスを書き出す"""
+    src_path = os.path.join(img_dir, source_dir)
+    images = {}
+    for filename in sorted(os.listdir(src_path)):
+        if filename.lower().endswith(".png"):
+            # インデックスのキーはゲーム内の画像指定と同じ "character/xxx.png" 形式
+            name = f"{source_dir}/{filename}"
+            images[name] = pygame.image.load(os.path.join(src_path, filename))
+
+    sizes = {name: img.get_size() for name, img in images.items()}
+    positions, w, h = _pack(sizes, ATLAS_MAX_WIDTH, ATLAS_PADDING)
+
+    atlas = pygame.Surface((max(w, 1), max(h, 1)), pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    index = {}
+    for name, img in images.items():
+        x, y = positions[name]
+        # カラーキー画像は透明部分の色を convert_alpha() した場合と揃えておく
+        colorkey = img.get_colorkey()
+        if colorkey:
+            atlas.fill((*colorkey[:3], 0), (x, y, *sizes[name]))
+        atlas.blit(img, (x, y))
+        index[name] = [x, y, *sizes[name]]
+
+    pygame.image.save(atlas, os.path.join(img_dir, ATLAS_IMAGE))
+    with open(os.path.join(img_dir, ATLAS_INDEX), "w", encoding="utf-8") as f:
+        json.dump({"image": ATLAS_IMAGE, "sprites": index}, f, indent=2)
+    return index
+
+
+class SpriteAtlas:
+    """
+    アトラス画像を1回だけ読み込み、スプライトをサブサーフェスとして返すクラス。
+    アトラスが未生成、または収録元の画像より古い場合は使わず、get() は None を返す。
+    デコードはどのスレッドからでも行えるが、変換（convert_alpha）は get() でメインスレッドから行う。
+    """
+
+    def __init__(self, img_dir):
+        self.img_dir = img_dir
+        self.sprites = {}  # 名前 -> (x, y, w, h)
+        self._image = None
+        self._loaded = False
+        self._converted = False  # アトラス画像を convert_alpha 済みか
+        self._lock = threading.Lock()
+
+    def _is_stale(self, atlas_path):
+        """収録元の画像がアトラス生成後に更新されていれば True"""
+        if hasattr(sys, "_MEIPASS"):
+            # PyInstaller の展開先は更新日時が当てにならないが、中身は生成時のまま
+            return False
+        src_path = os.path.join(self.img_dir, ATLAS_SOURCE_DIR)
+        if not os.path.isdir(src_path):
+            return False
+        built = os.path.getmtime(atlas_path)
+        return any(
+            entry.stat().st_mtime > built
+            for entry in os.scandir(src_path)
+            if entry.name.lower().endswith(".png")
+        )
+
+    def _load(self):
+        """アトラス画像のデコードとインデックスの読み込み（初回のみ。要ロック）"""
+        self._loaded = True
+        atlas_path = os.path.join(self.img_dir, ATLAS_IMAGE)
+        index_path = os.path.join(self.img_dir, ATLAS_INDEX)
+        if not (os.path.isfile(atlas_path) and os.path.isfile(index_path)):
+            return
+        if self._is_stale(atlas_path):
+            print("SpriteAtlas: アトラスが古いため個別の画像を読み込みます")
+            return
+
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            self._image = pygame.image.load(atlas_path)
+            self.sprites = {name: tuple(r) for name, r in index["sprites"].items()}
+        except (OSError, ValueError, KeyError, pygame.error) as e:
+            print(f"SpriteAtlas: Load Error - {e}")
+            self._image = None
+            self.sprites = {}
+
+    def decode(self, name):
+        """アトラスをデコードしておき、name が収録されていれば True（どのスレッドからでも可）"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            return name in self.sprites and self._image is not None
+
+    def get(self, name):
+        """スプライトのサブサーフェスを返す（アトラスに無ければ None。メインスレッドから呼ぶ）"""
+        if not self.decode(name):
+            return None
+        with self._lock:
+            if not self._converted:
+                self._image = self._image.convert_alpha()
+                self._converted = True
+            return self._image.subsurface(self.sprites[name])
+
+
+# 実行時に共有するアトラス（先読みのワーカースレッドからも作られるためロックで守る）
+_atlas = None
+_atlas_lock = threading.Lock()
+
+
+def _get_atlas(img_dir):
+    global _atlas
+    with _atlas_lock:
+        if _atlas is None or _atlas.img_dir != img_dir:
+            _atlas = SpriteAtlas(img_dir)
+        return _atlas
+
+
+def decode_sprite(base_dir, name):
+    """
+    assets/img 以下の画像 name のデコードだけを行う（どのスレッドからでも可）。
+    アトラスに収録されていればアトラスをデコードして None を、
+    なければ個別のファイルをデコードした Surface を返す。変換は finish_sprite() で行う。
+    """
+    img_dir = resource_path(os.path.join(base_dir, "img"))
+    if _get_atlas(img_dir).decode(name):
+        return None
+    return pygame.image.load(os.path.join(img_dir, name))
+
+
+def finish_sprite(base_dir, name, decoded=None):
+    """
+    画像 name を convert_alpha 済みで返す（メインスレッドから呼ぶこと）。
+    アトラスに収録されていればそこから切り出し、なければ decoded（None ならここでデコード）を変換する。
+    """
+    img_dir = resource_path(os.path.join(base_dir, "img"))
+    sprite = _get_atlas(img_dir).get(name)
+    if sprite is not None:
+        return sprite
+    if decoded is None:
+        decoded = pygame.image.load(os.path.join(img_dir, name))
+    return decoded.convert_alpha()
+
+
+def load_sprite(base_dir, name):
+    """
+    assets/img 以下の画像 name を読み込む（convert_alpha 済み）。
+    アトラスに収録されていればそこから切り出し、なければ個別のファイルを読み込む。
+    返り値のSurfaceは共有されることがあるため、呼び出し側で書き換えないでください。
+    メインスレッドから呼ぶこと。
+    """
+    return finish_sprite(base_dir, name)
+
+
+def main():
+    img_dir = os.path.join("assets", "img")
+    index = build_atlas(img_dir)
+    print(
+        f"{len(index)} 枚の画像を {os.path.join(img_dir, ATLAS_IMAGE)} にまとめました"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""
+ベンチマーク | src/bench.py
+SDL の dummy ドライバ上で App を動かし、シナリオごとのフレーム時間を計測する
+
+    python -m src.bench [--frames N] [--output PATH] [--baseline PATH]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# 画面・音声を持たない環境でも動くよう、pygame の読み込み前に設定する
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+from src.app import App, SCENE_GAME, SCENE_VN
+
+# --- 設定 ---
+DEFAULT_FRAMES = 600
+DEFAULT_WARMUP = 30
+DEFAULT_OUTPUT = "bench_output.json"
+DEFAULT_TOLERANCE = 0.10  # ベースライン比でこれ以上遅くなったら回帰とみなす
+
+# 計測対象のサブシステムとメソッド
+SUBSYSTEMS = {
+    "field": ("update", "draw"),
+    "talk": ("update", "draw"),
+    "vn": ("update", "draw"),
+}
+
+
+class ScriptedKeys:
+    """
+    pygame.key.get_pressed() の代わりに返すキー状態。
+    シナリオから押下中のキーを設定する。
+    """
+
+    def __init__(self):
+        self.down = set()
+
+    def __getitem__(self, key):
+        return key in self.down
+
+    def snapshot(self):
+        """現在の押下状態の複製（KeyTracker が前フレームの状態として保持するため）"""
+        copy = ScriptedKeys()
+        copy.down = set(self.down)
+        return copy
+
+
+class SubsystemTimer:
+    """サブシステムのメソッドをラップし、フレームごとの所要時間を記録する"""
+
+    def __init__(self):
+        self.current = {}  # 現フレームの計測値（ms）
+        self.samples = {}  # 名前 -> フレームごとの計測値のリスト
+
+    def wrap(self, obj, obj_name, method_name):
+        """インスタンスのメソッドを計測付きのものに差し替える"""
+        fn = getattr(obj, method_name)
+        name = f"{obj_name}.{method_name}"
+
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = (time.perf_counter() - t0) * 1000
+                self.current[name] = self.current.get(name, 0.0) + elapsed
+
+        setattr(obj, method_name, timed)
+        self.samples.setdefault(name, [])
+
+    def end_frame(self, record):
+        """フレームの計測値を確定する"""
+        if record:
+            for name, values in self.samples.items():
+                values.append(self.current.get(name, 0.0))
+        self.current = {}
+
+
+# --- シナリオ定義 ---
+# setup(app) で初期状態を作り、step(app, keys, frame) で毎フレームの入力を与える
+
+
+def _tap(keys, key, frame, interval, phase=0):
+    """interval フレームごとに 1 フレームだけキーを押す"""
+    if frame % interval == phase:
+        keys.down.add(key)
+    else:
+        keys.down.discard(key)
+
+
+def _post_key(key):
+    """KEYDOWN イベントを投入する"""
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+
+def _setup_walk(app):
+    app.field.load_map("world")
+    app.x, app.y = 214, 109
+    app.scene_state = SCENE_GAME
+
+
+def _step_walk(app, keys, frame):
+    # 上下左右を順に押し続けて周回する
+    route = (pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP)
+    keys.down = {route[(frame // 60) % len(route)]}
+
+
+def _setup_overview(app):
+    _setup_walk(app)
+    app.field.map_display = True
+
+
+def _step_overview(app, keys, frame):
+    pass
+
+
+def _setup_aichi_quiz(app):
+    app.field.load_map("aichi")
+    npc_x, npc_y = app.talk.dialogues["npc_1"]["position"]
+    app.x, app.y = npc_x, npc_y + 1
+    app.scene_state = SCENE_GAME
+
+
+def _step_aichi_quiz(app, keys, frame):
+    # Z で会話を開始・送り、クイズ中は選択肢を動かしながら回答する
+    _tap(keys, pygame.K_z, frame, 20)
+    if app.talk.quiz_mode and not app.talk.quiz_result_mode:
+        _tap(keys, pygame.K_DOWN, frame, 20, phase=10)
+
+
+def _setup_vn_opening(app):
+    app.scene_state = SCENE_VN
+    app.vn.start("opening")
+
+
+def _step_vn_opening(app, keys, frame):
+    # シナリオが終わったら最初から再生し直す
+    if not app.vn.active:
+        _setup_vn_opening(app)
+    if frame % 30 == 0:
+        _post_key(pygame.K_z)
+
+
+SCENARIOS = {
+    "walk_world": (_setup_walk, _step_walk),
+    "map_overview": (_setup_overview, _step_overview),
+    "aichi_quiz": (_setup_aichi_quiz, _step_aichi_quiz),
+    "vn_opening": (_setup_vn_opening, _step_vn_opening),
+}
+
+
+# --- 計測 ---
+
+
+def _summarize(values):
+    """平均・パーセンタイル（ms）を求める"""
+    if not values:
+        return {"mean": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    arr = np.asarray(values, dtype=np.float64)
+    return {
+        "mean": round(float(arr.mean()), 4),
+        "p95": round(float(np.percentile(arr, 95)), 4),
+        "p99": round(float(np.percentile(arr, 99)), 4),
+        "max": round(float(arr.max()), 4),
+    }
+
+
+def run_scenario(name, frames, warmup):
+    """シナリオを 1 つ実行し、フレーム時間とサブシステム時間を返す"""
+    setup, step = SCENARIOS[name]
+    keys = ScriptedKeys()
+    real_get_pressed = pygame.key.get_pressed
+    pygame.key.get_pressed = keys.snapshot
+
+    try:
+        app = App()
+        timer = SubsystemTimer()
+        for obj_name, methods in SUBSYSTEMS.items():
+            for method_name in methods:
+                timer.wrap(getattr(app, obj_name), obj_name, method_name)
+
+        setup(app)
+        frame_ms = []
+        for frame in range(warmup + frames):
+            step(app, keys, frame)
+            # 差分描画で変化のないフレームが省略されると描画時間を計れないため、
+            # 毎フレーム画面全体を描き直させる
+            app.mark_dirty()
+            t0 = time.perf_counter()
+            app._run_frame()
+            elapsed = (time.perf_counter() - t0) * 1000
+
+            record = frame >= warmup
+            if record:
+                frame_ms.append(elapsed)
+            timer.end_frame(record)
+    finally:
+        pygame.key.get_pressed = real_get_pressed
+
+    return {
+        "frame_ms": _summarize(frame_ms),
+        "subsystems_ms": {
+            name: _summarize(values) for name, values in timer.samples.items()
+        },
+    }
+
+
+def compare(result, baseline, tolerance):
+    """ベースラインとの比較結果を表示し、回帰があれば True を返す"""
+    regressed = False
+    for name, current in result["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            print(f"{name}: ベースラインなし")
+            continue
+        for metric in ("mean", "p95", "p99"):
+            now = current["frame_ms"][metric]
+            before = base["frame_ms"][metric]
+            ratio = (now - before) / before if before else 0.0
+            mark = ""
+            if ratio > tolerance:
+                mark = "  << 回帰"
+                regressed = True
+            print(
+                f"{name:<14} {metric:<4} {before:8.3f}ms -> {now:8.3f}ms "
+                f"({ratio:+.1%}){mark}"
+            )
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PBL-Game のフレーム時間ベンチマーク")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="結果JSONの出力先")
+    parser.add_argument("--baseline", help="比較対象のベースラインJSON")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="実行するシナリオ（省略時は全て）",
+    )
+    args = parser.parse_args(argv)
+
+    result = {
+        "meta": {
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "python": sys.version.split()[0],
+            "pygame": pygame.version.ver,
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        },
+        "scenarios": {},
+    }
+    for name in args.scenario or SCENARIOS:
+        result["scenarios"][name] = run_scenario(name, args.frames, args.warmup)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    print("\n=== フレーム時間 (ms) ===")
+    for name, data in result["scenarios"].items():
+        fm = data["frame_ms"]
+        print(
+            f"{name:<14} mean {fm['mean']:8.3f}  p95 {fm['p95']:8.3f}  "
+            f"p99 {fm['p99']:8.3f}"
+        )
+    print(f"結果を {args.output} に保存しました")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n=== ベースライン比較 ===")
+        if compare(result, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+コンパイル済み画像 | src/compiled_assets.py
+画像をデコード・変換・拡縮済みの生ピクセル（ディスプレイと同じ形式）として保存し、
+実行時はメモリマップしたファイルから Surface を作ることでデコードを省く
+
+    python -m src.compiled_assets    # タイトル・マップ・ノベル背景を事前にコンパイル
+
+コンパイル結果は実行時キャッシュの compiled に置き、マニフェストに記録した
+元画像の更新日時・サイズが変わっていればハッシュを比較し、内容が変わっていれば作り直す。
+"""
+
+import json
+import mmap
+import os
+import sys
+import threading
+import pygame
+from src.utils import CACHE_DIR, atomic_write, file_hash, resource_path
+
+COMPILED_DIR = os.path.join(CACHE_DIR, "compiled")
+COMPILED_MANIFEST = "manifest.json"
+COMPILED_VERSION = 1  # 保存形式を変えたら上げる
+
+
+def _variant_key(name, size):
+    """マニフェストのキー（画像名と拡縮後のサイズ）"""
+    variant = f"{size[0]}x{size[1]}" if size else "native"
+    return f"{name}@{variant}"
+
+
+def _source_stat(path):
+    """元画像ファイルの [更新日時, サイズ]"""
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _pixel_format():
+    """ディスプレイのピクセル形式に合わせた tobytes/frombuffer の形式名"""
+    display = pygame.display.get_surface()
+    if display and display.get_masks()[0] == 0xFF:
+        return "RGBA"
+    return "BGRA"
+
+
+class CompiledAssets:
+    """
+    コンパイル済み画像の読み込みと書き込みを行うクラス。
+    マニフェストは初回アクセス時に1回だけ読み込み、更新時はファイルごと置き換える。
+    """
+
+    def __init__(self, compiled_dir=COMPILED_DIR):
+        self.compiled_dir = compiled_dir
+        self._manifest = None
+        self._lock = threading.Lock()
+
+    def _get_manifest(self):
+        """マニフェスト（キー -> 保存情報）を返す（呼び出し側でロックすること）"""
+        if self._manifest is None:
+            self._manifest = {}
+            path = os.path.join(self.compiled_dir, COMPILED_MANIFEST)
+            if os.path.isfile(path):
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data.get("version") == COMPILED_VERSION:
+                        self._manifest = data.get("entries", {})
+                except (OSError, ValueError) as e:
+                    print(f"CompiledAssets: Manifest Load Error - {e}")
+        return self._manifest
+
+    def _is_current(self, entry, path):
+        """
+        エントリが元画像 path の現在の内容から作られたものか。
+        更新日時とサイズが記録と同じならハッシュは計算しない
+        """
+        stat = _source_stat(path)
+        if entry.get("stat") == stat:
+            return True
+        if entry["source"] != file_hash(path):
+            return False
+        # 内容は同じで更新日時だけが変わった（チェックアウトなど）ので記録を更新する
+        with self._lock:
+            entry["stat"] = stat
+            try:
+                self._write_manifest(self._get_manifest())
+            except OSError as e:
+                print(f"CompiledAssets: Write Error (manifest) - {e}")
+        return True
+
+    def load(self, name, path, size=None):
+        """
+        コンパイル済みの画像をメモリマップした Surface を返す（どのスレッドからでも可）。
+        未コンパイル、または元画像 path が変わっている場合は None
+        """
+        with self._lock:
+            entry = self._get_manifest().get(_variant_key(name, size))
+        if not entry or not self._is_current(entry, path):
+            return None
+
+        try:
+            with open(os.path.join(self.compiled_dir, entry["file"]), "rb") as f:
+                # 書き込み時コピーでマップし、Surface が書き換えられても元ファイルは変えない
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            surf = pygame.image.frombuffer(buf, tuple(entry["size"]), entry["format"])
+        except (OSError, ValueError, pygame.error) as e:
+            print(f"CompiledAssets: Load Error ({name}) - {e}")
+            return None
+
+        # 不透明な画像として扱う（アルファ合成なしで blit される）
+        surf.set_alpha(None)
+        return surf
+
+    def store(self, name, source_path, size, surface):
+        """変換・拡縮済みの surface を生ピクセルとして保存し、マニフェストに記録する"""
+        key = _variant_key(name, size)
+        filename = key.replace("/", "_").replace("@", "-") + ".raw"
+        fmt = _pixel_format()
+        path = os.path.join(self.compiled_dir, filename)
+
+        try:
+            os.makedirs(self.compiled_dir, exist_ok=True)
+            with atomic_write(path) as f:
+                f.write(pygame.image.tobytes(surface, fmt))
+
+            with self._lock:
+                manifest = self._get_manifest()
+                manifest[key] = {
+                    "file": filename,
+                    "size": list(surface.get_size()),
+                    "format": fmt,
+                    "source": file_hash(source_path),
+                    "stat": _source_stat(source_path),
+                }
+                self._write_manifest(manifest)
+        except OSError as e:
+            print(f"CompiledAssets: Write Error ({name}) - {e}")
+
+    def _write_manifest(self, manifest):
+        """マニフェストを書き出す（呼び出し側でロックすること）"""
+        path = os.path.join(self.compiled_dir, COMPILED_MANIFEST)
+        with atomic_write(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": COMPILED_VERSION, "entries": manifest},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+
+# 実行時に共有するインスタンス
+_compiled = CompiledAssets()
+
+
+def decode_image(base_dir, name, size=None):
+    """
+    assets/img 以下の不透明な画像 name のデコードだけを行う（どのスレッドからでも可）。
+    コンパイル済みならメモリマップした Surface を、なければ元画像をデコードした Surface を
+    (Surface, コンパイル済みか) の形で返す。変換・拡縮は finish_image() で行う。
+    """
+    path = resource_path(os.path.join(base_dir, "img", name))
+    surf = _compiled.load(name, path, size)
+    if surf is not None:
+        return surf, True
+    return pygame.image.load(path), False
+
+
+def finish_image(base_dir, name, size=None, decoded=None):
+    """
+    decode_image() の結果をディスプレイ形式に変換して返す（メインスレッドから呼ぶこと）。
+    コンパイル済みでなければ拡縮してコンパイル結果を保存する。decoded が None ならここでデコードする。
+    """
+    surf, compiled = decoded or decode_image(base_dir, name, size)
+    if compiled:
+        display = pygame.display.get_surface()
+        if display and surf.get_masks()[:3] != display.get_masks()[:3]:
+            surf = surf.convert()
+        return surf
+
+    surf = surf.convert()
+    if size:
+        surf = pygame.transform.scale(surf, size)
+    path = resource_path(os.path.join(base_dir, "img", name))
+    _compiled.store(name, path, size, surf)
+    return surf
+
+
+def load_image(base_dir, name, size=None):
+    """
+    assets/img 以下の不透明な画像 name を convert 済みで読み込む（size 指定時は拡縮）。
+    コンパイル済みのものがあればメモリマップで読み込み、なければ元画像から作って保存する。
+    メインスレッドから呼ぶこと。
+    """
+    return finish_image(base_dir, name, size)
+
+
+def compile_all(base_dir):
+    """タイトル・マップ・ノベル背景をまとめてコンパイルし、件数を返す"""
+    from src.core.visual_novel import VN_SCREEN_W, VN_SCREEN_H
+
+    img_dir = os.path.join(base_dir, "img")
+    targets = [("story/title.jpg", None)]
+    for filename in sorted(os.listdir(os.path.join(img_dir, "map"))):
+        if filename.startswith("world_map"):
+            targets.append((f"map/{filename}", None))
+    for filename in sorted(os.listdir(os.path.join(img_dir, "story"))):
+        if filename.lower().endswith((".jpg", ".png")):
+            targets.append((f"story/{filename}", (VN_SCREEN_W, VN_SCREEN_H)))
+
+    for name, size in targets:
+        load_image(base_dir, name, size)
+    return len(targets)
+
+
+def main():
+    pygame.init()
+    # ディスプレイ形式に合わせて変換するため、非表示のウィンドウを作る
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    count = compile_all(resource_path("assets"))
+    print(f"{count} 件の画像を {COMPILED_DIR} にコンパイルしました")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+BGM管理 | src/core/bgm.py
+同じ曲の継続再生、曲の切り替え時のクロスフェード、次に流れる曲の先読みを担当
+"""
+
+import threading
+from collections import OrderedDict
+import pygame
+
+BGM_VOLUME = 0.5
+CROSSFADE_MS = 1000  # 曲を切り替えるときのクロスフェード時間
+# デコード済みで保持する曲数（再生中の曲と次に流す曲。1曲あたり約 18MB）
+# ゲーム中の BGM は main.mp3 と Blue_Danube.mp3 の2曲のみ
+BGM_CACHE_TRACKS = 2
+
+
+class BgmManager:
+    """
+    BGM をデコード済みの Sound として予約チャンネルで再生するクラス。
+    2つのチャンネルを交互に使い、旧曲のフェードアウトと新曲のフェードインを重ねる。
+    デコードは常にワーカースレッドで行い、play() を呼んだスレッドを止めない。
+    未デコードの曲は、デコードの完了後に update() で再生を始める（それまで旧曲が流れ続ける）。
+    """
+
+    def __init__(self):
+        self.current = None  # 再生中（またはデコード完了後に再生する）曲のパス
+        self.playing = None  # 実際に再生中のチャンネルで流れている曲のパス
+        self._waiting = None  # デコード完了を待って再生する曲 (パス, フェード時間)
+        self._sounds = OrderedDict()  # パス -> デコード済み Sound（古い順）
+        self._pending = {}  # パス -> デコード完了通知用 Event
+        self._lock = threading.Lock()
+        self._channels = None  # BGM 用の予約チャンネル（効果音とは共有しない）
+        self._active = 0  # 再生中のチャンネル番号
+
+    def _get_channels(self):
+        """BGM 用のチャンネルを予約して返す（ミキサーの初期化後に1回だけ）"""
+        if self._channels is None:
+            pygame.mixer.set_reserved(2)
+            self._channels = [pygame.mixer.Channel(0), pygame.mixer.Channel(1)]
+        return self._channels
+
+    # --- 読み込み ---
+
+    def _decode(self, path):
+        """曲をデコードしてキャッシュに登録する（preload() のワーカースレッドで呼ばれる）"""
+        try:
+            sound = pygame.mixer.Sound(path)
+        except pygame.error as e:
+            print(f"BgmManager: Load Error ({path}) - {e}")
+            sound = None
+
+        with self._lock:
+            if sound is not None:
+                self._sounds[path] = sound
+                self._trim()
+            event = self._pending.pop(path, None)
+        if event:
+            event.set()
+        return sound
+
+    def _get_decoded(self, path):
+        """デコード済みの曲を返す（未デコードなら None。デコードは行わない）"""
+        with self._lock:
+            sound = self._sounds.get(path)
+            if sound is not None:
+                self._sounds.move_to_end(path)
+        return sound
+
+    def _trim(self):
+        """保持する曲数を超えた分を古い順に破棄する（再生中の曲は残す。要ロック）"""
+        for path in list(self._sounds):
+            if len(self._sounds) <= BGM_CACHE_TRACKS:
+                break
+            if path not in (self.current, self.playing):
+                del self._sounds[path]
+
+    def preload(self, paths):
+        """指定された曲をバックグラウンドでデコードしておく"""
+        if not pygame.mixer.get_init():
+            return
+        for path in paths:
+            with self._lock:
+                if path in self._sounds or path in self._pending:
+                    continue
+                self._pending[path] = threading.Event()
+            threading.Thread(target=self._decode, args=(path,), daemon=True).start()
+
+    # --- 再生制御 ---
+
+    def play(self, path, fade_ms=CROSSFADE_MS):
+        """
+        曲を再生する。再生中の曲と同じなら何もせず、そのまま流し続ける。
+        未デコードの曲はデコードを依頼して戻り、完了後の update() で切り替える
+        """
+        if not pygame.mixer.get_init():
+            return
+        channels = self._get_channels()
+        if path == self.playing and channels[self._active].get_busy():
+            # 流れている曲に戻す場合は、デコード待ちの曲を取り消してそのまま流し続ける
+            self._waiting = None
+            self.current = path
+            return
+        if path == self.current and self._waiting is not None:
+            return
+
+        self.current = path
+        sound = self._get_decoded(path)
+        if sound is None:
+            self._waiting = (path, fade_ms)
+            self.preload([path])
+            return
+        self._waiting = None
+        self._start(path, sound, fade_ms)
+
+    def is_waiting(self):
+        """デコード完了を待っている曲があるか（その間はメインループを待機させない）"""
+        return self._waiting is not None
+
+    def update(self):
+        """デコード待ちの曲が用意できていれば再生を始める（メインループから毎フレーム呼ぶ）"""
+        if self._waiting is None:
+            return
+        path, fade_ms = self._waiting
+        with self._lock:
+            sound = self._sounds.get(path)
+            decoding = path in self._pending
+        if sound is None:
+            if not decoding:
+                # デコードに失敗した（エラーは _decode で表示済み）
+                self._waiting = None
+            return
+        self._waiting = None
+        self._start(path, sound, fade_ms)
+
+    def _start(self, path, sound, fade_ms):
+        """旧曲をフェードアウトしながら、もう一方のチャンネルで新曲をフェードインする"""
+        channels = self._get_channels()
+        old = channels[self._active]
+        if old.get_busy():
+            old.fadeout(fade_ms)
+        else:
+            fade_ms = 0
+        self._active ^= 1
+        channel = channels[self._active]
+        channel.set_volume(BGM_VOLUME)
+        channel.play(sound, loops=-1, fade_ms=fade_ms)
+        self.playing = path
+
+    def stop(self, fade_ms=CROSSFADE_MS):
+        """BGM をフェードアウトして止める"""
+        self._waiting = None
+        if not pygame.mixer.get_init() or self._channels is None:
+            self.current = self.playing = None
+            return
+        for channel in self._channels:
+            if channel.get_busy():
+                channel.fadeout(fade_ms)
+        self.current = self.playing = None
@@ -6,12 +6,14 @@
 import pygame
 import os
 import math
-from src.utils import load_json, resource_path
+from src.utils import load_json, resource_path, surface_nbytes
+from src.core.map_loader import MapLoader
 
 # --- 定数設定 ---
 TILE = 10
 ZOOM = 2
 Z_TILE = TILE * ZOOM
+CHUNK_SIZE = 256  # 拡大マップを分割するチャンクの一辺（ピクセル）
 SCREEN_CENTER_X = 900 // 2
 SCREEN_CENTER_Y = 700 // 2
 Y_OFFSET = 1.0
@@ -32,23 +34,29 @@ class Field:
         self.dx = 0
         self.dy = 0
         self.offset = 0  # タイル間の移動進捗
-        self.speed = 2  # 1フレームあたりの移動ピクセル
+        self.speed = 2  # 1更新（tick）あたりの移動ピクセル
+        self._prev_camera = None  # 前回の更新時点のカメラ位置（補間描画用）
         self.dir = "front"
 
         # マップデータ関連
         self.map_image = None
-        self.map_image_zoom = None
-        self.map_pixels = None
+        self.chunk_cols = 0  # 拡大マップのチャンク数（横）
+        self.chunk_rows = 0  # 拡大マップのチャンク数（縦）
+        self.passable = None  # タイル単位の通行可能グリッド [x][y]
         self.map_pixel_w = 0
         self.map_pixel_h = 0
         self.map_w = 0
         self.map_h = 0
         self.current_map_id = None
+        self.current_image_name = None  # 拡大チャンクのキー（同じ画像のマップで共有）
         self.current_exits = {}
         self.map_data = (
             load_json(resource_path(os.path.join(self.BASE_DIR, "data", "maps.json")))
             or {}
         )
+        self.map_loader = MapLoader(
+            self.BASE_DIR, self.map_data, TILE, self.app.assets, Y_OFFSET, Y_DRIFT
+        )
 
         # 画面遷移（トランジション）関連
         self.transitioning = False
@@ -59,11 +67,11 @@ class Field:
         self.transition_target_map_id = None
         self.transition_dest_pos = None
 
-        # BGM管理
-        self._current_bgm_path = None
-
         # マップ表示フラグ
         self.map_display = False
+        self._overview = None  # 全体マップの縮小画像キャッシュ
+        self._overview_key = None  # (map_id, 画面サイズ)
+        self._animated_maps = {}  # map_id -> 動くNPCがいるか
 
         # 初期ロード
         self.load_map("world")
@@ -71,30 +79,45 @@ class Field:
 
     # --- 判定ロジック ---
 
-    def _is_sea_color(self, r, g, b):
-        """ピクセルの色が海（移動不可領域）かどうかを判定"""
-        return r < 25 and 90 <= g <= 155 and b >= 230
-
-    def _can_move_pixel(self, world_px, world_py):
-        """指定された座標が衝突判定（海など）に抵触しないか確認"""
-        if self.map_pixels is None:
+    def _is_passable(self, nx, ny):
+        """指定タイルが衝突判定（海など）に抵触しないか確認"""
+        if self.passable is None:
             return True
+        return bool(self.passable[nx, ny])
 
-        px, w, h = self.map_pixels, self.map_pixel_w, self.map_pixel_h
-        cx, cy = int(world_px), int(world_py)
-
-        # マップ範囲外チェック
-        if cx < 1 or cy < 1 or cx >= w - 1 or cy >= h - 1:
-            return False
+    # --- 更新処理 ---
 
-        # 周囲のピクセルを確認して判定
-        return not any(
-            self._is_sea_color(*px[x][y])
-            for x in range(cx - 1, cx + 2)
-            for y in range(cy - 1, cy + 2)
+    def begin_tick(self):
+        """
+        更新（tick）の開始時に毎回呼ぶ。会話中・シーンに関わらず進める処理
+        （補間描画用のカメラ位置の記録、NPCの揺れ）を行う
+        """
+        self._prev_camera = self.camera_pos()
+        if self.current_map_id is None:
+            return
+        talk = self.app.talk
+        for key in talk.npcs_on_map(self.current_map_id):
+            self._update_npc_animation(talk.dialogues[key])
+
+    def camera_pos(self):
+        """カメラ（プレイヤー）の位置（拡大前のマップ上のピクセル座標）"""
+        return (
+            self.app.x * TILE + self.offset * self.dx,
+            self.app.y * TILE + self.offset * self.dy,
         )
 
-    # --- 更新処理 ---
+    def _render_camera(self):
+        """前回と今回の更新の間を補間した、描画用のカメラ位置"""
+        cur_x, cur_y = self.camera_pos()
+        prev = self._prev_camera
+        if prev is None:
+            return cur_x, cur_y
+        prev_x, prev_y = prev
+        # マップ遷移などで大きく飛んだ場合は補間しない
+        if abs(cur_x - prev_x) > TILE or abs(cur_y - prev_y) > TILE:
+            return cur_x, cur_y
+        alpha = self.app.render_alpha
+        return prev_x + (cur_x - prev_x) * alpha, prev_y + (cur_y - prev_y) * alpha
 
     def update(self, keys):
         """毎フレームの更新処理"""
@@ -150,18 +173,40 @@ class Field:
         self._update_dir(dx, dy)
 
         # NPCがいるかチェック
-        for d in self.app.talk.dialogues.values():
-            if d.get("map_id") == self.current_map_id and d.get("position") == [nx, ny]:
-                return
+        if self.app.talk.npc_at(self.current_map_id, nx, ny):
+            return
 
         # 衝突判定（地形）
-        adj_py = ny * TILE + 5 + Y_OFFSET + (ny * Y_DRIFT)
-        if not self._can_move_pixel(nx * TILE + 5, adj_py):
+        if not self._is_passable(nx, ny):
             return
 
         # 移動開始フラグ
         self.dx, self.dy, self.moving, self.offset = dx, dy, True, 0
 
+    def is_animating(self):
+        """移動・画面遷移・NPCの揺れなど、毎フレーム描き直しが必要な状態か"""
+        if self.moving or self.transitioning:
+            return True
+        # 停止直後は補間描画が最新の位置に追いつくまで描き直す
+        if self._prev_camera is not None and self._prev_camera != self.camera_pos():
+            return True
+        if self.map_display:
+            return False
+
+        # 現マップに動くNPCがいるか（マップ毎に1回だけ調べる）
+        map_id = self.current_map_id
+        if map_id not in self._animated_maps:
+            talk = self.app.talk
+            self._animated_maps[map_id] = any(
+                talk.dialogues[key].get("movement_x", {}).get("enabled", False)
+                for key in talk.npcs_on_map(map_id)
+            )
+        return self._animated_maps[map_id]
+
+    def view_state(self):
+        """描画結果を左右する状態（差分描画の判定用）"""
+        return (self.current_map_id, self.dir, self.map_display)
+
     def _update_dir(self, dx, dy):
         """プレイヤーの向きを更新"""
         if dy == 1:
@@ -181,12 +226,9 @@ class Field:
             return
 
         if self.map_display:
-            # マップ表示モード：全体マップを縮小表示
+            # マップ表示モード：全体マップを縮小表示（マップ名込みでキャッシュ）
             screen_w, screen_h = screen.get_size()
-            scaled_map = pygame.transform.scale(
-                self.map_image_zoom, (screen_w, screen_h)
-            )
-            screen.blit(scaled_map, (0, 0))
+            screen.blit(self._get_overview((screen_w, screen_h)), (0, 0))
             # 縮小率を計算
             scale_x = screen_w / (self.map_pixel_w * ZOOM)
             scale_y = screen_h / (self.map_pixel_h * ZOOM)
@@ -195,24 +237,16 @@ class Field:
             player_y = self.app.y * TILE * ZOOM * scale_y
             # プレイヤー位置に赤い円を描画
             pygame.draw.circle(screen, (255, 0, 0), (int(player_x), int(player_y)), 5)
-            # 都道府県名を表示
-            name_surf = self.app.title_font.render(
-                self.current_map_name, True, (255, 255, 255)
-            )
-            screen.blit(name_surf, (800, 30))
             return
 
-        # 移動中の滑らかな表示オフセット計算
-        ox = self.offset * (-self.dx) * ZOOM
-        oy = self.offset * (-self.dy) * ZOOM
-
-        # マップの描画位置（プレイヤーを中心に据える）
-        base_x = SCREEN_CENTER_X - self.app.x * Z_TILE
-        base_y = SCREEN_CENTER_Y - self.app.y * Z_TILE
-        screen.blit(self.map_image_zoom, (base_x + ox, base_y + oy))
+        # マップの描画位置（補間したカメラ位置＝プレイヤーを中心に据える）
+        cam_x, cam_y = self._render_camera()
+        map_x = SCREEN_CENTER_X - round(cam_x * ZOOM)
+        map_y = SCREEN_CENTER_Y - round(cam_y * ZOOM)
+        self._draw_map_chunks(screen, map_x, map_y)
 
         # NPCの描画
-        self._draw_npcs(screen, base_x, base_y, ox, oy)
+        self._draw_npcs(screen, map_x, map_y)
 
         # プレイヤーの描画
         self.player_image = getattr(self, f"player_{self.dir}")
@@ -224,61 +258,77 @@ class Field:
 
         # 遷移アニメーションの描画（アイリスイン/アウト）
         if self.transitioning:
-            # 画面サイズに合わせたサーフェス作成
-            mask = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-            mask.fill((0, 0, 0, 255))  # まず全体を真っ黒にする
-
-            # 円の部分だけを「透明」で上書き描画する
-            # 第2引数の(0,0,0,0)が透明色（RGBA）
-            pygame.draw.circle(
-                mask,
-                (0, 0, 0, 0),
-                (SCREEN_CENTER_X, SCREEN_CENTER_Y),
-                max(
-                    0, int(self.transition_radius)
-                ),  # 半径がマイナスにならないようガード
-            )
-
-            screen.blit(mask, (0, 0))
-
-    def _draw_npcs(self, screen, base_x, base_y, ox, oy):
-        """NPCの描画とアニメーション処理"""
-        for _, data in self.app.talk.dialogues.items():
-            if data.get("map_id") != self.current_map_id:
-                continue
-
-            pos = data.get("position")
-            if not pos:
-                continue
-
-            nx, ny = pos
-
-            # NPCの左右移動（浮遊アニメーション等）の更新
-            z_npc_offset = self._update_npc_animation(data)
+            self.app.iris_mask.draw(screen, self.transition_radius)
 
-            # 画面上の座標計算
-            screen_x = SCREEN_CENTER_X + (nx - self.app.x) * Z_TILE + ox + z_npc_offset
-            screen_y = SCREEN_CENTER_Y + (ny - self.app.y) * Z_TILE + oy
-
-            # 画像のロードとスケール（キャッシュ化）
-            if "image_surface_zoom" not in data:
-                img_name = data.get("image")
-                if img_name:
-                    path = resource_path(os.path.join(self.BASE_DIR, "img", img_name))
-                    raw_img = pygame.image.load(path).convert_alpha()
-                    data["image_surface_zoom"] = pygame.transform.scale(
-                        raw_img, (Z_TILE, Z_TILE)
-                    )
-
-            npc_image = data.get("image_surface_zoom")
+    def _get_overview(self, size):
+        """全体マップの縮小画像（都道府県名入り）を返す。マップ・画面サイズ毎に1回だけ生成"""
+        key = (self.current_map_id, size)
+        if self._overview_key != key:
+            overview = pygame.transform.scale(self.map_image, size)
+            # 都道府県名を表示
+            name_surf = self.app.title_font.render(
+                self.current_map_name, True, (255, 255, 255)
+            )
+            overview.blit(name_surf, (800, 30))
+            self._overview = overview
+            self._overview_key = key
+        return self._overview
+
+    def _draw_map_chunks(self, screen, map_x, map_y):
+        """拡大マップのうち、画面に映るチャンクのみを描画"""
+        screen_w, screen_h = screen.get_size()
+
+        # 画面に掛かるチャンクの範囲（map_x, map_y はマップ左上の画面座標）
+        cx0 = max(0, int(-map_x) // CHUNK_SIZE)
+        cy0 = max(0, int(-map_y) // CHUNK_SIZE)
+        cx1 = min(self.chunk_cols, int(screen_w - map_x) // CHUNK_SIZE + 1)
+        cy1 = min(self.chunk_rows, int(screen_h - map_y) // CHUNK_SIZE + 1)
+
+        for cx in range(cx0, cx1):
+            for cy in range(cy0, cy1):
+                screen.blit(
+                    self._get_chunk(cx, cy),
+                    (map_x + cx * CHUNK_SIZE, map_y + cy * CHUNK_SIZE),
+                )
+
+    def _get_chunk(self, cx, cy):
+        """拡大済みチャンクを返す（初回表示時に元画像から生成し、共有キャッシュに保持）"""
+        key = ("chunk", self.current_image_name, cx, cy)
+        chunk = self.app.assets.get(key)
+        if chunk is None:
+            src = CHUNK_SIZE // ZOOM
+            x, y = cx * src, cy * src
+            part = self.map_image.subsurface(
+                (x, y, min(src, self.map_pixel_w - x), min(src, self.map_pixel_h - y))
+            )
+            w, h = part.get_size()
+            chunk = pygame.transform.scale(part, (w * ZOOM, h * ZOOM))
+            self.app.assets.put(key, chunk, surface_nbytes(chunk))
+        return chunk
+
+    def _draw_npcs(self, screen, map_x, map_y):
+        """NPCの描画（map_x, map_y はマップ左上の画面座標）"""
+        talk = self.app.talk
+        for key in talk.npcs_on_map(self.current_map_id):
+            data = talk.dialogues[key]
+            nx, ny = data["position"]
+
+            # 画面上の座標計算（左右の揺れは begin_tick で更新済み）
+            screen_x = map_x + nx * Z_TILE + data.get("offset_x", 0) * ZOOM
+            screen_y = map_y + ny * Z_TILE
+
+            # 拡大済みの画像（AssetManager でキャッシュ）
+            npc_image = self.app.assets.image(
+                data.get("image"), alpha=True, size=(Z_TILE, Z_TILE)
+            )
             if npc_image:
                 screen.blit(npc_image, (screen_x, screen_y))
 
     def _update_npc_animation(self, data):
-        """NPCの動き（offset_x）を計算して返す"""
+        """NPCの動き（offset_x）を1更新分進める"""
         config = data.get("movement_x", {})
         if not config.get("enabled", False):
-            return 0
+            return
 
         # 初期化
         if "offset_x" not in data:
@@ -291,8 +341,6 @@ class Field:
         if abs(data["offset_x"]) > data["max_offset_x"]:
             data["NPC_speed"] *= -1
 
-        return data["offset_x"] * ZOOM
-
     # --- マップ遷移処理 ---
 
     def _check_map_event(self):
@@ -344,28 +392,31 @@ class Field:
             return
 
         self.current_map_id = map_id
-        data = self.map_data[map_id]
-        self.current_map_name = data.get("name", map_id)
-        img_name = data.get("image", "map/world_map.png")
-        path = resource_path(os.path.join(self.BASE_DIR, "img", img_name))
-        self.map_image = pygame.image.load(path).convert()
+        # 画像・通行可能グリッド・出口など（キャッシュ済みならそれを受け取るだけ）
+        prepared = self.map_loader.load(map_id)
+        self.current_map_name = prepared["name"]
+        self.map_image = prepared["image"]
+        self.current_image_name = prepared["image_name"]
+        self.passable = prepared["passable"]
         self.map_pixel_w, self.map_pixel_h = self.map_image.get_size()
+        self._overview_key = None  # 全体マップの縮小画像を作り直す
 
-        # 描画用拡大マップ作成
-        self.map_image_zoom = pygame.transform.scale(
-            self.map_image, (self.map_pixel_w * ZOOM, self.map_pixel_h * ZOOM)
-        )
+        # 描画用の拡大チャンクは表示時に生成する（_get_chunk を参照）
+        self.chunk_cols = math.ceil(self.map_pixel_w * ZOOM / CHUNK_SIZE)
+        self.chunk_rows = math.ceil(self.map_pixel_h * ZOOM / CHUNK_SIZE)
 
-        # 衝突判定用のピクセル配列
-        self.map_pixels = pygame.surfarray.array3d(self.map_image)
+        # 衝突判定はタイル単位
         self.map_w = self.map_pixel_w // TILE
         self.map_h = self.map_pixel_h // TILE
 
-        # 出口データの整理
-        self.current_exits = {(e["x"], e["y"]): e for e in data.get("exits", [])}
+        # 出口データ
+        self.current_exits = prepared["exits"]
 
         # BGM更新
-        self._update_bgm(data.get("bgm"))
+        self._update_bgm(prepared["bgm"])
+
+        # 遷移しうる隣接マップをバックグラウンドで先読み
+        self.prefetch_maps(self._neighbor_map_ids(map_id))
 
         # --- 自動イベント発火 ---
         # 九工大マップに入ったとき、初回のみノベルパート"entering_kyutech"を開始
@@ -378,6 +429,25 @@ class Field:
             self.app.scene_state = 2  # SCENE_VN
             self.app.vn.start("entering_kyutech")
 
+    def prefetch_maps(self, map_ids):
+        """指定マップの画像・衝突判定と BGM をバックグラウンドで先読み"""
+        self.map_loader.prefetch(map_ids)
+        self.app.system.preload_bgm(
+            os.path.join("assets", "sounds", self.map_data[m]["bgm"])
+            for m in map_ids
+            if self.map_data.get(m, {}).get("bgm")
+        )
+
+    def _neighbor_map_ids(self, map_id):
+        """出口および現マップの NPC の map_trigger から遷移先マップ一覧を返す"""
+        targets = [e["target_map"] for e in self.current_exits.values()]
+        talk = self.app.talk
+        for key in talk.npcs_on_map(map_id):
+            map_trigger = talk.dialogues[key].get("map_trigger")
+            if map_trigger:
+                targets.append(map_trigger)
+        return [t for t in targets if t != map_id]
+
     def _update_bgm(self, bgm_path):
         """マップデータに基づくBGMの更新"""
         if not pygame.mixer.get_init():
@@ -392,37 +462,30 @@ class Field:
         print("DEBUG: _update_bgm called with", bgm_path)
         self.app.system.play_bgm(target_path)
 
-    def _get_scaled_player_surface(self, path, color):
+    def _get_scaled_player_surface(self, name, color):
         """プレイヤー画像をロードし、なければ単色タイルを返す"""
-        if os.path.isfile(path):
-            img = pygame.image.load(path).convert_alpha()
-            return pygame.transform.scale(img, (Z_TILE, Z_TILE))
+        img = self.app.assets.image(name, alpha=True, size=(Z_TILE, Z_TILE))
+        if img:
+            return img
 
         surf = pygame.Surface((Z_TILE, Z_TILE))
         surf.fill(color)
         return surf
 
     def load_player(self):
-        """全方向のプレイヤー画像をロード"""
-        img_dir = os.path.join(self.BASE_DIR, "img")
+        """全方向のプレイヤー画像をロード（ロード済みなら向きのみ初期化）"""
+        if getattr(self, "player_front", None) is not None:
+            self.player_image = self.player_front
+            return
 
         self.player_front = self._get_scaled_player_surface(
-            resource_path(
-                os.path.join(self.BASE_DIR, "img", "character", "player_front.png")
-            ),
-            (255, 0, 0),
+            "character/player_front.png", (255, 0, 0)
         )
         self.player_back = self._get_scaled_player_surface(
-            resource_path(
-                os.path.join(self.BASE_DIR, "img", "character", "player_back.png")
-            ),
-            (0, 255, 0),
+            "character/player_back.png", (0, 255, 0)
         )
         self.player_right = self._get_scaled_player_surface(
-            resource_path(
-                os.path.join(self.BASE_DIR, "img", "character", "player_right.png")
-            ),
-            (0, 0, 255),
+            "character/player_right.png", (0, 0, 255)
         )
         # 左向きは右向きの反転で対応
         self.player_left = pygame.transform.flip(self.player_right, True, False)
@@ -0,0 +1,141 @@
+"""
+マップ読み込み | src/core/map_loader.py
+マップ画像と衝突判定データの準備、隣接マップのバックグラウンド先読みを担当
+（準備済みデータは AssetManager の共有キャッシュに保持する）
+"""
+
+import os
+import threading
+from src.utils import QueueWorker, resource_path
+from src.core.terrain import load_passable_grid
+from src.compiled_assets import decode_image, finish_image
+
+DEFAULT_MAP_IMAGE = "map/world_map.png"
+
+
+class MapLoader:
+    """
+    マップごとの表示用画像・通行可能グリッド・出口・メタデータを準備するクラス。
+    画像と通行可能グリッドは画像ファイルごとに AssetManager の共有キャッシュ
+    （メモリ上限付きの LRU）に保持し、同じ画像を使うマップでは1つを共有する。
+    表示中のマップの画像は共有キャッシュから外して保持し、破棄されないようにする。
+    prefetch() で指定したマップはワーカースレッドで先にデコードしておき、
+    Surface の変換は load() でメインスレッドから行う。
+    """
+
+    def __init__(
+        self,
+        base_dir,
+        map_data,
+        tile,
+        assets,
+        y_offset=0.0,
+        y_drift=0.0,
+    ):
+        self.base_dir = base_dir
+        self.map_data = map_data
+        self.terrain_params = (tile, y_offset, y_drift)
+        self.assets = assets  # 画像ごとのデータは ("map", 画像名) をキーに保持
+        self._pinned = None  # 表示中のマップの (画像名, データ)
+
+        # 先読み管理
+        self._pending = {}  # 画像名 -> 完了通知用 Event
+        self._lock = threading.Lock()
+        self._worker = QueueWorker(self._prefetch_one, "MapLoader")
+
+    def _image_name(self, map_id):
+        return self.map_data[map_id].get("image", DEFAULT_MAP_IMAGE)
+
+    # --- 準備処理 ---
+
+    def _prepare(self, img_name):
+        """
+        画像のデコードと通行可能グリッドの取得（どのスレッドからでも可）。
+        Surface の変換はしない（"image" は load() で設定する）
+        """
+        path = resource_path(os.path.join(self.base_dir, "img", img_name))
+        decoded = decode_image(self.base_dir, img_name)
+        passable = load_passable_grid(path, decoded[0], *self.terrain_params)
+        w, h = decoded[0].get_size()
+        # 変換後はディスプレイ形式（4バイト/ピクセル）になる
+        nbytes = w * h * 4 + passable.nbytes
+        return {
+            "image": None,
+            "decoded": decoded,
+            "passable": passable,
+            "nbytes": nbytes,
+        }
+
+    def _load_entry(self, img_name):
+        """画像ごとのデータを返し、表示中のものとして固定する（メインスレッドから呼ぶ）"""
+        if self._pinned and self._pinned[0] == img_name:
+            return self._pinned[1]
+
+        with self._lock:
+            event = self._pending.get(img_name)
+        # 先読み中ならワーカーの完了を待つ
+        if event:
+            event.wait()
+
+        # 表示中は共有キャッシュから外す（上限の計算に含めず、破棄もされない）
+        entry = self.assets.pop(("map", img_name))
+        if entry is None:
+            entry = self._prepare(img_name)
+        if entry["image"] is None:
+            # ディスプレイ形式への変換（未コンパイルならコンパイルも）はメインスレッドで行う
+            entry["image"] = finish_image(
+                self.base_dir, img_name, decoded=entry.pop("decoded")
+            )
+
+        # 前に表示していたマップは共有キャッシュに戻す（戻ってきたときに再利用する）
+        if self._pinned:
+            old_name, old_entry = self._pinned
+            self.assets.put(("map", old_name), old_entry, old_entry["nbytes"])
+        self._pinned = (img_name, entry)
+        return entry
+
+    def load(self, map_id):
+        """
+        マップの準備済みデータを返す（キャッシュ済み・先読み済みならデコードの待ち時間なし）。
+        メインスレッドから呼ぶこと
+        """
+        data = self.map_data[map_id]
+        img_name = self._image_name(map_id)
+        entry = self._load_entry(img_name)
+        return {
+            "image": entry["image"],
+            "image_name": img_name,
+            "passable": entry["passable"],
+            "exits": {(e["x"], e["y"]): e for e in data.get("exits", [])},
+            "name": data.get("name", map_id),
+            "bgm": data.get("bgm"),
+        }
+
+    # --- 先読み ---
+
+    def prefetch(self, map_ids):
+        """キャッシュにない指定マップの画像をバックグラウンドでデコードする"""
+        names = [self._image_name(m) for m in map_ids if m in self.map_data]
+        pinned = self._pinned[0] if self._pinned else None
+
+        queued = []
+        with self._lock:
+            for img_name in dict.fromkeys(names):
+                if img_name == pinned or img_name in self._pending:
+                    continue
+                if ("map", img_name) in self.assets:
+                    continue
+                self._pending[img_name] = threading.Event()
+                queued.append(img_name)
+        self._worker.put(queued)
+
+    def _prefetch_one(self, img_name):
+        """先読みを1件処理する（ワーカースレッドで呼ばれる）"""
+        try:
+            entry = self._prepare(img_name)
+            self.assets.put(("map", img_name), entry, entry["nbytes"])
+        except Exception as e:
+            print(f"MapLoader: Prefetch Error ({img_name}) - {e}")
+        finally:
+            with self._lock:
+                self._pending.pop(img_name).set()
@@ -0,0 +1,199 @@
+"""
+ノベルスクリプトの束 | src/core/script_bundle.py
+novel_scripts 以下の JSON を、ラベル表と解決済みのジャンプ先を持つ1つのファイルにまとめる
+コンパイル処理と、実行時に script_id ごとに必要な部分だけを読み込む処理を提供
+
+    python -m src.core.script_bundle    # assets/data/novel_scripts.bundle を生成
+
+ファイル形式: 1行目がヘッダ（JSON、各スクリプトの位置と長さ・元ファイルの情報）、
+以降に各スクリプトの JSON を連結したもの。
+"""
+
+import json
+import os
+import sys
+from src.utils import atomic_write, load_json, resource_path
+
+SCRIPTS_DIR = os.path.join("assets", "data", "novel_scripts")
+BUNDLE_PATH = os.path.join("assets", "data", "novel_scripts.bundle")
+BUNDLE_VERSION = 1  # 形式を変えたら上げる
+
+# ラベル名で分岐先を指定するキー（解決後の番号は "<キー>_index" に入る）
+JUMP_KEYS = ("jump_to", "jump_correct", "jump_wrong")
+
+
+def compile_script(script_id, nodes):
+    """
+    スクリプトのラベル表を作り、ジャンプ先のラベルをシーン番号に解決する。
+    返り値は (解決済みのシーンのリスト, ラベル表, エラーメッセージのリスト)
+    """
+    labels = {}
+    errors = []
+    for i, node in enumerate(nodes):
+        label = node.get("label")
+        if label:
+            if label in labels:
+                errors.append(f"{script_id}[{i}]: ラベル '{label}' が重複しています")
+            labels[label] = i
+
+    compiled = []
+    for i, node in enumerate(nodes):
+        node = dict(node)
+        for key in JUMP_KEYS:
+            label = node.get(key)
+            if not label:
+                continue
+            if label in labels:
+                node[f"{key}_index"] = labels[label]
+            else:
+                errors.append(
+                    f"{script_id}[{i}]: {key} のラベル '{label}' がありません"
+                )
+        compiled.append(node)
+    return compiled, labels, errors
+
+
+def _source_files(scripts_dir):
+    """元の JSON ファイルの一覧（ファイル名 -> [サイズ, 更新日時]）"""
+    sources = {}
+    if os.path.isdir(scripts_dir):
+        for entry in os.scandir(scripts_dir):
+            if entry.name.endswith(".json"):
+                st = entry.stat()
+                sources[entry.name] = [st.st_size, st.st_mtime_ns]
+    return sources
+
+
+def _load_sources(scripts_dir):
+    """元の JSON を全て読み込み、(script_id -> シーンのリスト, エラー) を返す"""
+    scripts = {}
+    errors = []
+    for filename in sorted(_source_files(scripts_dir)):
+        data = load_json(os.path.join(scripts_dir, filename)) or {}
+        for script_id, nodes in data.items():
+            if script_id in scripts:
+                errors.append(
+                    f"{filename}: スクリプトID '{script_id}' が重複しています"
+                )
+            scripts[script_id] = nodes
+    return scripts, errors
+
+
+def build_bundle(scripts_dir=SCRIPTS_DIR, bundle_path=BUNDLE_PATH):
+    """
+    スクリプトの束を書き出す。ラベルの誤りなどがあれば書き出さずにエラーのリストを返す
+    """
+    scripts, errors = _load_sources(scripts_dir)
+    blobs = []
+    for script_id, nodes in scripts.items():
+        compiled, labels, script_errors = compile_script(script_id, nodes)
+        errors.extend(script_errors)
+        blob = json.dumps(
+            {"nodes": compiled, "labels": labels},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        blobs.append((script_id, blob))
+    if errors:
+        return errors
+
+    # 各スクリプトの位置はヘッダの直後からの相対位置
+    index = {}
+    offset = 0
+    for script_id, blob in blobs:
+        index[script_id] = [offset, len(blob)]
+        offset += len(blob)
+    header = {
+        "version": BUNDLE_VERSION,
+        "sources": _source_files(scripts_dir),
+        "scripts": index,
+    }
+
+    with atomic_write(bundle_path) as f:
+        f.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+        for _, blob in blobs:
+            f.write(blob)
+    return []
+
+
+class ScriptBundle:
+    """
+    ノベルスクリプトを script_id ごとに遅延読み込みするクラス。
+    束が無い、または元の JSON より古い場合は、元の JSON を全て読み込んで同じ形に変換する。
+    """
+
+    def __init__(self, scripts_dir=SCRIPTS_DIR, bundle_path=BUNDLE_PATH):
+        self.scripts_dir = resource_path(scripts_dir)
+        self.bundle_path = resource_path(bundle_path)
+        self._index = {}  # script_id -> (位置, 長さ)
+        self._body_offset = 0  # ヘッダの直後の位置
+        # 束を使わない場合の元データ（script_id -> シーンのリスト）
+        self._sources = None
+        self._loaded = {}  # script_id -> (シーンのリスト, ラベル表)
+
+        if not self._open_bundle():
+            self._sources, errors = _load_sources(self.scripts_dir)
+            for message in errors:
+                print(f"ScriptBundle: {message}")
+
+    def _open_bundle(self):
+        """束のヘッダを読み込む。使える束であれば True"""
+        if not os.path.isfile(self.bundle_path):
+            return False
+        try:
+            with open(self.bundle_path, "rb") as f:
+                header = json.loads(f.readline())
+                self._body_offset = f.tell()
+        except (OSError, ValueError) as e:
+            print(f"ScriptBundle: Load Error - {e}")
+            return False
+
+        if header.get("version") != BUNDLE_VERSION:
+            return False
+        # PyInstaller の展開先は更新日時が当てにならないが、中身は生成時のまま
+        if not hasattr(sys, "_MEIPASS"):
+            if header.get("sources") != _source_files(self.scripts_dir):
+                print("ScriptBundle: 束が古いため元の JSON を読み込みます")
+                return False
+        self._index = {k: tuple(v) for k, v in header["scripts"].items()}
+        return True
+
+    def __contains__(self, script_id):
+        if self._sources is not None:
+            return script_id in self._sources
+        return script_id in self._index
+
+    def get(self, script_id):
+        """(シーンのリスト, ラベル表) を返す。存在しなければ None"""
+        if script_id in self._loaded:
+            return self._loaded[script_id]
+        if script_id not in self:
+            return None
+
+        if self._sources is not None:
+            nodes, labels, errors = compile_script(script_id, self._sources[script_id])
+            for message in errors:
+                print(f"ScriptBundle: {message}")
+        else:
+            offset, length = self._index[script_id]
+            with open(self.bundle_path, "rb") as f:
+                f.seek(self._body_offset + offset)
+                data = json.loads(f.read(length))
+            nodes, labels = data["nodes"], data["labels"]
+
+        self._loaded[script_id] = (nodes, labels)
+        return self._loaded[script_id]
+
+
+def main():
+    errors = build_bundle()
+    if errors:
+        for message in errors:
+            print(f"エラー: {message}")
+        return 1
+    print(f"ノベルスクリプトを {BUNDLE_PATH} にまとめました")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@
 import os
 import pygame
 from src.utils import save_json, load_json, SAVEFILE, resource_path
+from src.core.bgm import BgmManager
 
 
 class System:
@@ -16,6 +17,7 @@ class System:
     def __init__(self, app):
         self.app = app
         self.savefile = SAVEFILE
+        self.bgm = BgmManager()
 
         # ゲーム進行フラグの初期化
         self.flags = {
@@ -134,15 +136,20 @@ class System:
             print("BGM not found:", full_path)
             return
 
+        # 再生中と同じ曲なら続きから流し続け、違う曲ならクロスフェードで切り替える
         try:
-            pygame.mixer.music.stop()
-            pygame.mixer.music.load(full_path)
-            pygame.mixer.music.set_volume(0.5)
-            pygame.mixer.music.play(-1)
+            self.bgm.play(full_path)
         except Exception as e:
             print(f"System: BGM Playback Error - {e}")
 
+    def preload_bgm(self, paths):
+        """次に流れる可能性のある曲を先にデコードしておく"""
+        if not pygame.mixer.get_init():
+            return
+        full_paths = [resource_path(p) for p in paths if p]
+        self.bgm.preload([p for p in full_paths if os.path.isfile(p)])
+
     def stop_bgm(self):
         # ミキサーが使用可能かチェック
         if pygame.mixer.get_init():
-            pygame.mixer.music.stop()
+            self.bgm.stop()
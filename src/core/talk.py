@@ -4,8 +4,7 @@ dialogues.json を読み込み、Z で進行、Q で離脱、矢印で選択、
 """
 
 import os
-import pygame
-from src.ui import draw_window
+from src.ui import draw_window, render_choice_buttons, translucent_surface
 from src.utils import load_json, resource_path
 
 
@@ -23,6 +22,11 @@ class Talk:
         )
         self.dialogues = load_json(dialogues_path) or {}
 
+        # NPC の空間インデックス（(map_id, x, y) -> NPCキー / map_id -> NPCキー一覧）
+        self.npc_index = {}
+        self.npcs_by_map = {}
+        self._build_npc_index()
+
         # --- 状態管理変数の初期化（ここが漏れるとエラーになります） ---
         self.active = None  # 現在会話中のNPCキー
         self.window_lines = []  # 表示するテキストリスト
@@ -34,6 +38,43 @@ class Talk:
         self.quiz_index = 0  # 複数クイズのインデックス
         self.quiz_text_input = ""  # テキスト入力モード時の入力内容
         self.wait_frames = 0
+        self._quiz_buttons = []  # 現在の問題の選択肢ボタン画像 [(通常, 選択中)]
+        self._quiz_buttons_for = None  # ボタン画像を作った問題
+
+    # --- NPC インデックス ---
+
+    def _build_npc_index(self):
+        """dialogues から NPC の位置インデックスを構築"""
+        self.npc_index = {}
+        self.npcs_by_map = {}
+        for key, data in self.dialogues.items():
+            pos = data.get("position")
+            if not pos:
+                continue
+            map_id = data.get("map_id")
+            self.npc_index[(map_id, pos[0], pos[1])] = key
+            self.npcs_by_map.setdefault(map_id, []).append(key)
+
+    def npc_at(self, map_id, x, y):
+        """指定マップ・タイルにいる NPC のキーを返す（いなければ None）"""
+        return self.npc_index.get((map_id, x, y))
+
+    def npcs_on_map(self, map_id):
+        """指定マップにいる NPC のキー一覧を返す"""
+        return self.npcs_by_map.get(map_id, [])
+
+    def view_state(self):
+        """描画結果を左右する状態（差分描画の判定用）"""
+        return (
+            self.active,
+            self.line_index,
+            tuple(self.window_lines),
+            self.quiz_mode,
+            self.quiz_result_mode,
+            self.quiz_index,
+            self.quiz_choice,
+            self.quiz_text_input,
+        )
 
     def is_active(self):
         """現在会話中（ウィンドウが表示されるべき状態）か判定"""
@@ -305,12 +346,14 @@ class Talk:
             return
 
         px, py = self.app.x, self.app.y
+        map_id = self.app.field.current_map_id
 
-        for key, data in self.dialogues.items():
-            pos = data.get("position")
-            if pos and abs(pos[0] - px) + abs(pos[1] - py) == 1:
+        # 上下左右の隣接タイルを確認
+        for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+            key = self.npc_at(map_id, px + dx, py + dy)
+            if key:
                 self.active = key
-                self._open_dialog(data)
+                self._open_dialog(self.dialogues[key])
                 break
 
     def _open_dialog(self, data):
@@ -383,42 +426,16 @@ class Talk:
         btn_x = (sw - btn_w) // 2
 
         # 背景を少し暗くするオーバーレイ
-        overlay = pygame.Surface((sw, int(total_h + 40)), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 100))
+        overlay = translucent_surface((sw, total_h + 40), (0, 0, 0, 100))
         screen.blit(overlay, (0, int(start_y - 10)))
 
-        for i, choice in enumerate(choices):
+        # ボタン画像は問題ごとに1回だけ作り、カーソル移動時は選ぶだけ
+        if self._quiz_buttons_for is not self.current_quiz:
+            self._quiz_buttons = render_choice_buttons(
+                font, choices, (btn_w, btn_h), 15
+            )
+            self._quiz_buttons_for = self.current_quiz
+
+        for i, (normal, selected) in enumerate(self._quiz_buttons):
             y = int(start_y + i * (btn_h + margin))
-            r = pygame.Rect(btn_x, y, btn_w, btn_h)
-            is_selected = i == self.quiz_choice
-
-            # 色設定
-            if is_selected:
-                bg_color = (60, 120, 180, 230)
-                border_color = (255, 255, 200)
-                text_color = (255, 255, 255)
-            else:
-                bg_color = (40, 40, 60, 200)
-                border_color = (150, 150, 150)
-                text_color = (200, 200, 200)
-
-            # ボタン背景
-            btn_surf = pygame.Surface((btn_w, btn_h), pygame.SRCALPHA)
-            btn_surf.fill(bg_color)
-            screen.blit(btn_surf, r.topleft)
-
-            # 枠線
-            pygame.draw.rect(screen, border_color, r, 3 if is_selected else 2)
-
-            # テキスト
-            text_surf = font.render(choice, True, text_color)
-            text_rect = text_surf.get_rect(center=r.center)
-            screen.blit(text_surf, text_rect)
-
-            # 選択中の矢印
-            if is_selected:
-                cursor_surf = font.render("▶", True, border_color)
-                screen.blit(
-                    cursor_surf,
-                    (r.left + 15, r.centery - cursor_surf.get_height() // 2),
-                )
+            screen.blit(selected if i == self.quiz_choice else normal, (btn_x, y))
@@ -0,0 +1,111 @@
+"""
+地形判定 | src/core/terrain.py
+海の色判定ルールと、タイル単位の通行可能グリッドの構築・ディスクキャッシュを提供
+"""
+
+import hashlib
+import os
+import numpy as np
+import pygame
+from src.utils import CACHE_DIR, atomic_write, file_hash
+
+TERRAIN_CACHE_DIR = os.path.join(CACHE_DIR, "terrain")
+TERRAIN_CACHE_VERSION = 1  # 判定アルゴリズムを変えたら上げる
+
+# --- 海判定ルール（RGB） ---
+SEA_R_MAX = 25  # R はこの値未満
+SEA_G_MIN = 90  # G はこの範囲内
+SEA_G_MAX = 155
+SEA_B_MIN = 230  # B はこの値以上
+
+
+def is_sea_color(r, g, b):
+    """
+    ピクセルの色が海（移動不可領域）かどうかを判定。
+    r, g, b は数値でも numpy 配列でもよい（配列なら要素ごとの bool 配列を返す）
+    """
+    return (r < SEA_R_MAX) & (g >= SEA_G_MIN) & (g <= SEA_G_MAX) & (b >= SEA_B_MIN)
+
+
+def build_passable_grid(surface, tile, y_offset=0.0, y_drift=0.0):
+    """
+    マップ画像からタイル単位の通行可能グリッド（bool配列, [x][y]）を構築する。
+    各タイルの判定点 (x * tile + 5, y * tile + 5 + y_offset + y * y_drift) の
+    周囲 3x3 ピクセルに海が含まれる場合、またはマップ端に接する場合は通行不可。
+    """
+    w, h = surface.get_size()
+    map_w, map_h = w // tile, h // tile
+
+    # 各タイルの判定点（ピクセル座標）
+    cx = np.arange(map_w) * tile + 5
+    ys = np.arange(map_h)
+    cy = (ys * tile + 5 + y_offset + ys * y_drift).astype(np.int64)
+
+    # マップ範囲外チェック（判定点の周囲 1px が画像内に収まること）
+    valid_x = (cx >= 1) & (cx < w - 1)
+    valid_y = (cy >= 1) & (cy < h - 1)
+
+    # 判定点の周囲 3x3 の座標列（範囲外は端に寄せ、後で valid で除外）
+    win = np.array([-1, 0, 1])
+    xs = np.clip((cx[:, None] + win).ravel(), 0, w - 1)
+    ys = np.clip((cy[:, None] + win).ravel(), 0, h - 1)
+
+    # 必要なピクセルだけを参照する（画像全体のコピーは作らない）
+    try:
+        pixels = pygame.surfarray.pixels3d(surface)
+        rgb = pixels[np.ix_(xs, ys)]
+        del pixels  # サーフェスのロックを解除
+    except ValueError:
+        # 24/32bit 以外のサーフェスはコピー経由で取得
+        rgb = pygame.surfarray.array3d(surface)[np.ix_(xs, ys)]
+
+    sea = is_sea_color(rgb[..., 0], rgb[..., 1], rgb[..., 2])
+
+    # 3x3 ブロック単位で「海を含むか」を集計
+    sea_near = sea.reshape(map_w, 3, map_h, 3).any(axis=(1, 3))
+    return ~sea_near & valid_x[:, None] & valid_y[None, :]
+
+
+def _terrain_cache_key(image_path, tile, y_offset, y_drift):
+    """画像の内容と判定ルールのパラメータから求めたハッシュ値"""
+    h = hashlib.sha1(file_hash(image_path).encode("ascii"))
+    rule = (
+        TERRAIN_CACHE_VERSION,
+        (SEA_R_MAX, SEA_G_MIN, SEA_G_MAX, SEA_B_MIN),
+        (tile, y_offset, y_drift),
+    )
+    h.update(repr(rule).encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_passable_grid(
+    image_path, surface, tile, y_offset=0.0, y_drift=0.0, cache_dir=TERRAIN_CACHE_DIR
+):
+    """
+    通行可能グリッドをディスクキャッシュ（.npy, メモリマップ）から読み込む。
+    キャッシュは画像の内容と判定ルールのハッシュで管理し、どちらかが変われば作り直す。
+    """
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    key = _terrain_cache_key(image_path, tile, y_offset, y_drift)
+    cache_path = os.path.join(cache_dir, f"{stem}-{key}.npy")
+
+    if os.path.isfile(cache_path):
+        try:
+            return np.load(cache_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            print(f"terrain: キャッシュ読み込みエラー - {e}")
+
+    grid = build_passable_grid(surface, tile, y_offset, y_drift)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # 同じ画像名の古いキャッシュを削除
+        for name in os.listdir(cache_dir):
+            if name.startswith(f"{stem}-") and name.endswith(".npy"):
+                os.remove(os.path.join(cache_dir, name))
+        with atomic_write(cache_path) as f:
+            np.save(f, grid)
+    except OSError as e:
+        print(f"terrain: キャッシュ書き込みエラー - {e}")
+
+    return grid
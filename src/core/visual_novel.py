@@ -5,14 +5,17 @@
 
 import pygame
 import os
-from src.utils import resource_path, load_json
-from src.ui import draw_window
+from src.utils import QueueWorker, resource_path
+from src.core.script_bundle import ScriptBundle
+from src.text_layout import layout_lines
+from src.ui import draw_window, render_choice_buttons, translucent_surface, text_width
 
 # --- レイアウト定数 ---
 VN_SCREEN_W = 900
 VN_SCREEN_H = 700
 CHAR_POS = (VN_SCREEN_W // 2, 600)  # 立ち絵の配置（中央下部）
 TEXT_BOX_RECT = (50, 500, 800, 150)
+PREFETCH_NODES = 6  # 現在のシーンから先読みするシーン数（分岐先を含む）
 
 
 class VisualNovel:
@@ -35,52 +38,47 @@ class VisualNovel:
         self.choice_items = []
         self.choice_index = 0
         self.choice_rects = []  # ボタンの当たり判定用
-        self.labels = {}  # ジャンプ用ラベルマップ
+        self.choice_sprites = []  # ボタン画像 [(通常, 選択中)]
+        self.labels = {}  # ジャンプ用ラベルマップ（ラベル -> シーン番号）
 
         # リソース管理
         self.bg_image = None
         self.char_image = None
         self.char_offset_y = 0  # 立ち絵のY座標オフセット
-        self._image_cache = {}  # 重複ロード防止用のキャッシュ
+        self._reported_missing = set()  # 見つからないと報告済みの画像名
 
-        # データロード
-        self.scripts_data = {}
+        # 先読み管理（この先のシーンの画像をワーカースレッドで読み込む）
+        self._prefetcher = QueueWorker(self._prefetch_scene, "VisualNovel")
 
-        # 2. novel_scripts フォルダ内のJSONをロード・マージ
-        scripts_dir = os.path.join(self.base_dir, "data", "novel_scripts")
-        if os.path.isdir(scripts_dir):
-            for filename in os.listdir(scripts_dir):
-                if filename.endswith(".json"):
-                    file_path = os.path.join(scripts_dir, filename)
-                    data = load_json(file_path)
-                    if data:
-                        self.scripts_data.update(data)
+        # データロード（スクリプトは start() 時に script_id ごとに読み込む）
+        self.scripts = ScriptBundle()
 
         self.font = app.font
         self.ui_font = app.font
 
     def start(self, script_id):
         """指定されたIDのシナリオを開始する"""
-        if script_id not in self.scripts_data:
+        loaded = self.scripts.get(script_id)
+        if loaded is None:
             print(f"VisualNovel: Script ID '{script_id}' not found.")
             self.end_scene()
             return
 
+        # 前のスクリプトの先読みが残っていれば破棄する
+        self._prefetcher.clear()
         self.script_id = script_id
-        self.script = self.scripts_data[script_id]
+        self.script, self.labels = loaded
         self.index = 0
         self.active = True
 
-        self._scan_labels()
+        self._layout_script()
         self._load_current_scene()
 
-    def _scan_labels(self):
-        """現在のスクリプト内のラベルをスキャンして記録"""
-        self.labels = {}
-        for i, data in enumerate(self.script):
-            label = data.get("label")
-            if label:
-                self.labels[label] = i
+    def _layout_script(self):
+        """スクリプト全体のテキストを先に行分割しておく（描画時はキャッシュを引くだけ）"""
+        width = text_width(TEXT_BOX_RECT[2])
+        for data in self.script:
+            layout_lines(self.font, self._text_lines(data), width)
 
     def update(self, events):
         """入力処理"""
@@ -114,33 +112,37 @@ class VisualNovel:
             if is_click or is_space:
                 self._advance()
 
-    def _get_cached_image(self, name, alpha=False):
-        """画像をロードし、キャッシュから返す。名前が 'none' の場合は None を返す。"""
+    def view_state(self):
+        """描画結果を左右する状態（差分描画の判定用）"""
+        return (
+            self.active,
+            self.script_id,
+            self.index,
+            self.waiting_for_choice,
+            self.choice_index,
+            id(self.bg_image),
+            id(self.char_image),
+            self.char_offset_y,
+        )
+
+    def _get_cached_image(self, name, alpha=False, size=None):
+        """
+        画像を AssetManager 経由で返す。名前が 'none' の場合は None を返す。
+        背景（alpha=False）は画面サイズに、立ち絵は size 指定時にその大きさに拡縮する。
+        """
         if not name or name.lower() == "none":
             return None
 
-        if name in self._image_cache:
-            return self._image_cache[name]
-
         path = resource_path(os.path.join(self.base_dir, "img", name))
         if not os.path.isfile(path):
-            print(f"VisualNovel: Resource not found - {path}")
+            if name not in self._reported_missing:
+                self._reported_missing.add(name)
+                print(f"VisualNovel: Resource not found - {path}")
             return None
 
-        try:
-            # ロード処理
-            img = pygame.image.load(path)
-            img = img.convert_alpha() if alpha else img.convert()
-
-            # 背景の場合は画面サイズにリサイズ
-            if not alpha:
-                img = pygame.transform.scale(img, (VN_SCREEN_W, VN_SCREEN_H))
-
-            self._image_cache[name] = img
-            return img
-        except Exception as e:
-            print(f"VisualNovel: Error loading image {name} - {e}")
-            return None
+        if not alpha:
+            return self.app.assets.image(name, size=(VN_SCREEN_W, VN_SCREEN_H))
+        return self.app.assets.image(name, alpha=True, size=size, smooth=True)
 
     def _load_current_scene(self):
         """現在のインデックスに基づき背景と立ち絵を更新する"""
@@ -165,6 +167,8 @@ class VisualNovel:
                 next_map.get("x"),
                 next_map.get("y"),
             )
+            # ノベル中に遷移先のマップと BGM を準備しておく
+            self.app.field.prefetch_maps([next_map["map_id"]])
 
         # 背景の更新（指定がある場合のみ）
         bg_name = data.get("bg")
@@ -185,29 +189,9 @@ class VisualNovel:
                 img = self._get_cached_image(char_name, alpha=True)
                 if img:
                     # 指定されたスケール、または自動縮小
-                    custom_scale = data.get("char_scale")
-
-                    if custom_scale:
-                        # JSONでスケール指定がある場合
-                        w, h = img.get_size()
-                        new_size = (int(w * custom_scale), int(h * custom_scale))
-                        img = pygame.transform.smoothscale(img, new_size)
-
-                        # オフセット指定（y座標調整用）
-                        if "char_offset_y" in data:
-                            self.char_offset_y = data["char_offset_y"]
-                        else:
-                            self.char_offset_y = 0
-                    else:
-                        # 自動調整: 画面高さの80%程度に収める
-                        h_limit = int(VN_SCREEN_H * 0.8)
-                        w, h = img.get_size()
-                        if h > h_limit:
-                            scale = h_limit / h
-                            new_size = (int(w * scale), int(h * scale))
-                            img = pygame.transform.smoothscale(img, new_size)
-                        self.char_offset_y = 0
-
+                    new_size, self.char_offset_y = self._char_layout(img, data)
+                    if new_size:
+                        img = self._get_cached_image(char_name, True, new_size)
                     self.char_image = img
 
         # 背景立ち絵リセット（明示的な指定がない限りオフセットはリセットしない実装も可能だが、シーンごと描画なのでリセットが無難）
@@ -228,6 +212,74 @@ class VisualNovel:
         else:
             self.waiting_for_choice = False
 
+        # この先に進みうるシーンの画像を先読み
+        self._prefetch_ahead()
+
+    def _char_layout(self, img, data):
+        """立ち絵の表示サイズ（拡縮しない場合は None）と Y 座標オフセットを返す"""
+        w, h = img.get_size()
+        custom_scale = data.get("char_scale")
+        if custom_scale:
+            # JSONでスケール指定がある場合（オフセット指定はy座標調整用）
+            new_size = (int(w * custom_scale), int(h * custom_scale))
+            return new_size, data.get("char_offset_y", 0)
+
+        # 自動調整: 画面高さの80%程度に収める
+        h_limit = int(VN_SCREEN_H * 0.8)
+        if h > h_limit:
+            scale = h_limit / h
+            return (int(w * scale), int(h * scale)), 0
+        return None, 0
+
+    # --- 先読み ---
+
+    def _next_indices(self, index):
+        """シーン index から進みうるシーンの番号（_advance / _confirm_choice と同じ規則）"""
+        data = self.script[index]
+        if not data.get("choices"):
+            keys = ("jump_to_index",)
+        elif data.get("answer") is not None:
+            keys = ("jump_correct_index", "jump_wrong_index")
+        else:
+            keys = ()
+        targets = [data[k] for k in keys if data.get(k) is not None]
+        if not keys or len(targets) < len(keys):
+            targets.append(index + 1)
+        return [i for i in targets if i < len(self.script)]
+
+    def _prefetch_ahead(self):
+        """現在のシーンから分岐を含めて PREFETCH_NODES 個先までの画像を先読みする"""
+        if not self.active:
+            return
+        seen = {self.index}
+        frontier = [self.index]
+        nodes = []
+        while frontier and len(nodes) < PREFETCH_NODES:
+            next_frontier = []
+            for i in frontier:
+                for j in self._next_indices(i):
+                    if j not in seen and len(nodes) < PREFETCH_NODES:
+                        seen.add(j)
+                        nodes.append(self.script[j])
+                        next_frontier.append(j)
+            frontier = next_frontier
+
+        self._prefetcher.put(nodes)
+
+    def _prefetch_scene(self, data):
+        """
+        シーンの背景・立ち絵をデコードしておく（ワーカースレッドで呼ばれ、結果は AssetManager に残る）。
+        変換・立ち絵の拡縮は表示するときにメインスレッドで行う
+        """
+        for name, alpha in ((data.get("bg"), False), (data.get("char"), True)):
+            if not name or name.lower() == "none":
+                continue
+            path = resource_path(os.path.join(self.base_dir, "img", name))
+            if not os.path.isfile(path):
+                continue  # 見つからないことは表示時に報告する
+            size = None if alpha else (VN_SCREEN_W, VN_SCREEN_H)
+            self.app.assets.prefetch(name, alpha=alpha, size=size)
+
     def _setup_choice_layout(self):
         """選択肢ボタンのレイアウト計算"""
         self.choice_rects = []
@@ -248,6 +300,15 @@ class VisualNovel:
             rect = pygame.Rect(btn_x, y, btn_w, item_h)
             self.choice_rects.append(rect)
 
+        # ボタン画像（通常・選択中）を選択肢の表示開始時に1回だけ作る
+        labels = [
+            item.get("text", "") if isinstance(item, dict) else str(item)
+            for item in self.choice_items
+        ]
+        self.choice_sprites = render_choice_buttons(
+            self.ui_font, labels, (btn_w, item_h), 20
+        )
+
     def _advance(self):
         """次のシーンへ進む（ジャンプまたはインクリメント）"""
         if self.index >= len(self.script):
@@ -255,10 +316,10 @@ class VisualNovel:
             return
 
         data = self.script[self.index]
-        jump_to = data.get("jump_to")
+        jump_to = data.get("jump_to_index")  # ラベルは読み込み時に番号へ解決済み
 
-        if jump_to and jump_to in self.labels:
-            self.index = self.labels[jump_to]
+        if jump_to is not None:
+            self.index = jump_to
         else:
             self.index += 1
 
@@ -269,22 +330,20 @@ class VisualNovel:
         data = self.script[self.index]
         correct_idx = data.get("answer")
 
-        next_label = None
+        next_index = None
 
-        # 正解/不正解による分岐
+        # 正解/不正解による分岐（ラベルは読み込み時に番号へ解決済み）
         if correct_idx is not None:
             if self.choice_index == correct_idx:
-                next_label = data.get("jump_correct")
+                next_index = data.get("jump_correct_index")
             else:
-                next_label = data.get("jump_wrong")
-        else:
-            pass
+                next_index = data.get("jump_wrong_index")
 
         self.waiting_for_choice = False
 
         # 分岐先へジャンプ、なければ次へ
-        if next_label and next_label in self.labels:
-            self.index = self.labels[next_label]
+        if next_index is not None:
+            self.index = next_index
         else:
             self.index += 1
 
@@ -319,16 +378,17 @@ class VisualNovel:
         if self.index >= len(self.script):
             return
 
-        data = self.script[self.index]
-        text = data.get("text", "")
-        speaker = data.get("speaker", "")
+        lines = self._text_lines(self.script[self.index])
+        draw_window(screen, self.font, lines, rect=TEXT_BOX_RECT)
 
+    def _text_lines(self, data):
+        """シーンの話者名と本文を表示行のリストにする（折り返し前）"""
         lines = []
+        speaker = data.get("speaker", "")
         if speaker:
             lines.append(f"【{speaker}】")
-        lines.append(text)
-
-        draw_window(screen, self.font, lines, rect=TEXT_BOX_RECT)
+        lines.append(data.get("text", ""))
+        return lines
 
     def _draw_choices(self, screen):
         """選択肢ウィンドウの描画（ボタン風）"""
@@ -336,46 +396,12 @@ class VisualNovel:
             return
 
         # 背景（全体を少し暗くする）
-        overlay = pygame.Surface((VN_SCREEN_W, VN_SCREEN_H), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))
+        overlay = translucent_surface((VN_SCREEN_W, VN_SCREEN_H), (0, 0, 0, 128))
         screen.blit(overlay, (0, 0))
 
-        for i, item in enumerate(self.choice_items):
-            rect = self.choice_rects[i]
-            is_selected = i == self.choice_index
-
-            # 色設定
-            if is_selected:
-                bg_color = (60, 120, 180, 230)  # 青っぽくハイライト
-                border_color = (255, 255, 200)
-                text_color = (255, 255, 255)
-            else:
-                bg_color = (40, 40, 60, 200)  # 通常暗色
-                border_color = (150, 150, 150)
-                text_color = (200, 200, 200)
-
-            # ボタン背景
-            btn_surf = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-            btn_surf.fill(bg_color)
-            screen.blit(btn_surf, rect.topleft)
-
-            # 枠線
-            pygame.draw.rect(screen, border_color, rect, 3 if is_selected else 2)
-
-            # テキスト描画
-            text = item.get("text", "") if isinstance(item, dict) else str(item)
-            text_surf = self.ui_font.render(text, True, text_color)
-            text_rect = text_surf.get_rect(center=rect.center)
-            screen.blit(text_surf, text_rect)
-
-            # 選択中の矢印
-            if is_selected:
-                cursor_char = "▶"
-                cursor_surf = self.ui_font.render(cursor_char, True, border_color)
-                screen.blit(
-                    cursor_surf,
-                    (rect.left + 20, rect.centery - cursor_surf.get_height() // 2),
-                )
+        for i, (normal, selected) in enumerate(self.choice_sprites):
+            sprite = selected if i == self.choice_index else normal
+            screen.blit(sprite, self.choice_rects[i].topleft)
 
     def end_scene(self):
         """ノベルパートを終了し、RPGパートへ遷移する"""
@@ -0,0 +1,117 @@
+"""
+テキストレイアウト | src/text_layout.py
+日本語の禁則処理に対応した行分割（指定ピクセル幅での折り返し）と、その結果のキャッシュを提供
+"""
+
+from src.utils import LRUCache
+
+LAYOUT_CACHE_BYTES = 1 * 1024 * 1024  # 行分割結果キャッシュの上限（バイト、概算）
+
+# --- 禁則文字 ---
+# 行頭に置かない文字（句読点・閉じ括弧・小書き文字・長音など）
+LINE_START_FORBIDDEN = frozenset(
+    "、。，．・：；？！゛゜ヽヾゝゞ々ー〜…‥"
+    "）］｝」』】〕〉》〙〗〟’”"
+    "ぁぃぅぇぉっゃゅょゎァィゥェォッャュョヮヵヶ"
+    ",.:;?!)]}"
+)
+# 行末に置かない文字（開き括弧）
+LINE_END_FORBIDDEN = frozenset("（［｛「『【〔〈《〘〖〝‘“([{")
+
+# 行分割の結果のキャッシュ（(font, text, width) -> 行のタプル）
+_layout_cache = LRUCache(LAYOUT_CACHE_BYTES)
+
+
+def _is_word_char(ch):
+    """英数字（単語の途中では改行しない文字）かどうか"""
+    return ch.isascii() and ch.isalnum()
+
+
+def _can_break(prev, ch):
+    """prev と ch の間で改行してよいか"""
+    if prev in LINE_END_FORBIDDEN or ch in LINE_START_FORBIDDEN:
+        return False
+    return not (_is_word_char(prev) and _is_word_char(ch))
+
+
+def _advances(font, text):
+    """各文字の送り幅（px）"""
+    metrics = font.metrics(text)
+    return [m[4] if m else font.size(ch)[0] for m, ch in zip(metrics, text)]
+
+
+def _wrap_paragraph(font, text, width):
+    """改行を含まない文字列を width 以内の行に分割する"""
+    if not text:
+        return [""]
+
+    adv = _advances(font, text)
+    lines = []
+    start = 0  # 現在の行の先頭位置
+    line_w = 0
+    last_break = None  # 現在の行で最後に改行できる位置（その文字の前で改行）
+
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if i > start and _can_break(text[i - 1], ch):
+            last_break = i
+        line_w += adv[i]
+        if line_w <= width or i == start:
+            i += 1
+            continue
+
+        if last_break is not None:
+            # 改行できる位置まで戻して次の行へ送る（追い出し）
+            cut = last_break
+        elif ch in LINE_START_FORBIDDEN:
+            # 戻れる位置がなければ行頭禁則文字は行末にぶら下げる
+            i += 1
+            continue
+        else:
+            cut = i
+
+        lines.append(text[start:cut].rstrip(" "))
+        # 次の行は先頭の空白を詰め、その位置から幅を測り直す
+        start = cut
+        while start < len(text) and text[start] == " ":
+            start += 1
+        i = start
+        line_w = 0
+        last_break = None
+
+    # 末尾の空白だけが行からはみ出した場合は空行を作らない
+    if start < len(text) or not lines:
+        lines.append(text[start:])
+    return lines
+
+
+def layout_text(font, text, width):
+    """
+    text を font で描画したときに width（px）に収まるよう行分割し、行のタプルを返します。
+    改行文字でも改行します。結果は (font, text, width) ごとにキャッシュします。
+    """
+    width = int(width)
+    key = (font, text, width)
+    lines = _layout_cache.get(key)
+    if lines is None:
+        lines = tuple(
+            line
+            for paragraph in text.split("\n")
+            for line in _wrap_paragraph(font, paragraph, width)
+        )
+        _layout_cache.put(key, lines, 64 + sum(len(line) * 4 + 56 for line in lines))
+    return lines
+
+
+def layout_lines(font, lines, width):
+    """複数の文字列をそれぞれ行分割し、1つのリストにまとめて返します。"""
+    result = []
+    for text in lines:
+        result.extend(layout_text(font, text, width) if text else ("",))
+    return result
+
+
+def layout_cache_stats():
+    """行分割キャッシュのヒット率などを返します。"""
+    return _layout_cache.stats()
@@ -1,14 +1,70 @@
 """
 UI描画ユーティリティ | src/ui.py
-テキストウィンドウや目標バーなどの共通UI部品の描画を提供
+テキストウィンドウや目標バーなどの共通UI部品、文字描画キャッシュ、画面遷移用マスクの描画を提供
 """
 
+import numpy as np
 import pygame
+from src.utils import LRUCache, surface_nbytes
+from src.text_layout import layout_lines
 
 # --- デフォルト設定 ---
 DEFAULT_PADDING = 12
 WINDOW_BORDER_COLOR = (200, 200, 200)
 WINDOW_BORDER_WIDTH = 2
+TEXT_CACHE_BYTES = 8 * 1024 * 1024  # 文字描画キャッシュの上限（バイト）
+SURFACE_POOL_BYTES = 16 * 1024 * 1024  # 半透明サーフェスプールの上限（バイト）
+
+# 描画済み文字列のキャッシュ（(font, text, color, antialias) -> Surface）
+_text_cache = LRUCache(TEXT_CACHE_BYTES)
+
+
+def render_text(font, text, color, antialias=True):
+    """
+    font.render の結果をキャッシュして返します。
+    同じフォント・文字列・色の組み合わせは2回目以降ラスタライズしません。
+    返り値のSurfaceは共有されるため、呼び出し側で書き換えないでください。
+    """
+    key = (font, text, tuple(color), antialias)
+    surf = _text_cache.get(key)
+    if surf is None:
+        surf = font.render(text, antialias, color)
+        _text_cache.put(key, surf, surface_nbytes(surf))
+    return surf
+
+
+def text_cache_stats():
+    """文字描画キャッシュのヒット率などを返します。"""
+    return _text_cache.stats()
+
+
+# 塗りつぶし済み半透明サーフェスのプール（(size, rgba) -> Surface）
+_surface_pool = LRUCache(SURFACE_POOL_BYTES)
+
+
+def translucent_surface(size, rgba):
+    """
+    指定サイズ・色（アルファ値込み）で塗りつぶした半透明サーフェスを返します。
+    同じ組み合わせは使い回すため、毎フレームの生成と塗りつぶしが発生しません。
+    返り値のSurfaceは共有されるため、呼び出し側で書き換えないでください。
+    """
+    key = ((int(size[0]), int(size[1])), tuple(rgba))
+    surf = _surface_pool.get(key)
+    if surf is None:
+        surf = pygame.Surface(key[0], pygame.SRCALPHA)
+        surf.fill(key[1])
+        _surface_pool.put(key, surf, surface_nbytes(surf))
+    return surf
+
+
+def surface_pool_stats():
+    """半透明サーフェスプールの使用状況を返します。"""
+    return _surface_pool.stats()
+
+
+def text_width(window_width):
+    """ウィンドウ幅からパディングを除いた、テキストを折り返す幅"""
+    return int(window_width) - DEFAULT_PADDING * 2
 
 
 def draw_window(
@@ -19,28 +75,32 @@ def draw_window(
     bgcolor=(0, 0, 0),
     fg=(255, 255, 255),
     alpha=200,
+    wrap=True,
 ):
     """
     指定された範囲にテキストウィンドウを描画します。
-    背後を透過させるために一時的なSurfaceを使用します。
+    背後を透過させるためにプールされた半透明Surfaceを使用します。
+    wrap が True の場合、各行をウィンドウ幅で折り返します（結果はキャッシュされます）。
+    ウィンドウの高さに収まらない行は描画しません。
     """
     x, y, w, h = rect
 
     # 1. ウィンドウ本体の描画（半透明対応）
-    window_surf = pygame.Surface((w, h), pygame.SRCALPHA)
-    window_surf.fill((*bgcolor, alpha))
-    surface.blit(window_surf, (x, y))
+    surface.blit(translucent_surface((w, h), (*bgcolor, alpha)), (x, y))
 
     # 2. 枠線の描画
     pygame.draw.rect(surface, WINDOW_BORDER_COLOR, (x, y, w, h), WINDOW_BORDER_WIDTH)
 
     # 3. テキストの描画
+    if wrap:
+        lines = layout_lines(font, lines, text_width(w))
     line_h = font.get_linesize()
-    for i, line in enumerate(lines):
+    max_lines = max(0, (h - DEFAULT_PADDING * 2) // line_h)
+    for i, line in enumerate(lines[: int(max_lines)]):
         if not line:
             continue
 
-        text_surf = font.render(line, True, fg)
+        text_surf = render_text(font, line, fg)
         # 指定座標からパディング分ずらして描画
         dest_pos = (x + DEFAULT_PADDING, y + DEFAULT_PADDING + i * line_h)
         surface.blit(text_surf, dest_pos)
@@ -63,9 +123,117 @@ def draw_objective_bar(
 
     # テキストの描画（垂直中央揃え）
     if text:
-        text_surf = font.render(text, True, fg)
+        text_surf = render_text(font, text, fg)
 
         # 垂直方向の中央座標を計算
         text_y = y + (h - text_surf.get_height()) // 2
         # 左端から少し余白を空けて描画
         surface.blit(text_surf, (x + 15, text_y))
+
+
+# --- 選択肢ボタン ---
+# (背景色RGBA, 枠線色, 文字色, 枠線の太さ)
+CHOICE_STYLE_NORMAL = ((40, 40, 60, 200), (150, 150, 150), (200, 200, 200), 2)
+CHOICE_STYLE_SELECTED = ((60, 120, 180, 230), (255, 255, 200), (255, 255, 255), 3)
+CHOICE_CURSOR = "▶"
+
+
+def render_choice_button(font, text, size, selected, cursor_x):
+    """
+    選択肢ボタン1つ分（背景・枠線・文字・選択中の矢印）を半透明Surfaceに描画して返します。
+    cursor_x はボタン左端から矢印までの距離です。
+    """
+    bg_color, border_color, text_color, border_w = (
+        CHOICE_STYLE_SELECTED if selected else CHOICE_STYLE_NORMAL
+    )
+    button = pygame.Surface(size, pygame.SRCALPHA)
+    button.fill(bg_color)
+    rect = button.get_rect()
+
+    # 枠線
+    pygame.draw.rect(button, border_color, rect, border_w)
+
+    # テキスト
+    text_surf = render_text(font, text, text_color)
+    button.blit(text_surf, text_surf.get_rect(center=rect.center))
+
+    # 選択中の矢印
+    if selected:
+        cursor_surf = render_text(font, CHOICE_CURSOR, border_color)
+        button.blit(
+            cursor_surf, (cursor_x, rect.centery - cursor_surf.get_height() // 2)
+        )
+    return button
+
+
+def render_choice_buttons(font, labels, size, cursor_x):
+    """
+    選択肢の一覧から、各ボタンの (通常, 選択中) のSurfaceの組のリストを作ります。
+    選択肢の表示開始時に1回だけ呼び、カーソル移動時は組から選ぶだけにします。
+    """
+    return [
+        (
+            render_choice_button(font, text, size, False, cursor_x),
+            render_choice_button(font, text, size, True, cursor_x),
+        )
+        for text in labels
+    ]
+
+
+class IrisMask:
+    """
+    アイリスイン/アウト用の円形マスク。
+    中心からの距離場を一度だけ計算し、マスク用サーフェスを使い回します。
+    半径が変わったフレームのみ円を囲む範囲のアルファ値を書き換えます。
+    """
+
+    def __init__(self, size, center=None):
+        w, h = size
+        self.size = size
+        self.center = center if center else (w // 2, h // 2)
+        cx, cy = self.center
+
+        # 中心からの距離場（surfarray と同じ [x][y] 配置）
+        xs = np.arange(w, dtype=np.float32) - cx
+        ys = np.arange(h, dtype=np.float32) - cy
+        self._dist = np.hypot(xs[:, None], ys[None, :])
+        self._outside = np.empty((w, h), dtype=bool)  # 円の外側判定の作業領域
+        self.max_radius = float(self._dist.max())
+
+        self._mask = pygame.Surface(size, pygame.SRCALPHA)
+        self._mask.fill((0, 0, 0, 255))
+        self._radius = 0  # 現在マスクに反映されている半径
+
+    def _bounds(self, radius):
+        """半径 radius の円を囲む矩形（画面内にクリップ）"""
+        w, h = self.size
+        cx, cy = self.center
+        x0, y0 = max(0, cx - radius), max(0, cy - radius)
+        x1, y1 = min(w, cx + radius + 1), min(h, cy + radius + 1)
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def draw(self, surface, radius):
+        """半径 radius の円の外側を黒く塗る"""
+        radius = max(0, int(radius))  # 半径がマイナスにならないようガード
+        if radius >= self.max_radius:
+            return
+
+        box = self._bounds(radius)
+        if radius != self._radius:
+            # 円を囲む範囲のみ、内側を透明(0)、外側を不透明(255)に書き換える
+            sx, sy = slice(box.left, box.right), slice(box.top, box.bottom)
+            outside = self._outside[sx, sy]
+            np.greater_equal(self._dist[sx, sy], radius, out=outside)
+            alpha = pygame.surfarray.pixels_alpha(self._mask)
+            np.multiply(outside, 255, out=alpha[sx, sy], casting="unsafe")
+            del alpha  # サーフェスのロックを解除
+            self._radius = radius
+
+        # 矩形の外側は単色で塗り、内側だけマスクを重ねる
+        w, h = self.size
+        black = (0, 0, 0)
+        surface.fill(black, (0, 0, w, box.top))
+        surface.fill(black, (0, box.bottom, w, h - box.bottom))
+        surface.fill(black, (0, box.top, box.left, box.height))
+        surface.fill(black, (box.right, box.top, w - box.right, box.height))
+        surface.blit(self._mask, box.topleft, box)
@@ -1,15 +1,49 @@
 """
 汎用ユーティリティ | src/utils.py
-キー状態取得、JSON save/load、リソースパス解決
+キー状態取得、JSON save/load、リソースパス解決、キャッシュの保存先とファイルハッシュ、
+ファイルの置き換え書き込み、LRU キャッシュ、ワーカースレッドのキュー
 """
 
 import pygame
+import hashlib
 import json
+import os
+import queue
 import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 
+APP_NAME = "PBL-Game"
+
+
+def _cache_dir():
+    """
+    実行時に生成するキャッシュの保存先を返します。
+    開発環境ではリポジトリ直下の cache、実行ファイル化後はユーザーごとのキャッシュ用ディレクトリ
+    （起動時のカレントディレクトリに依存させない）。ホームが分からない場合は一時ディレクトリ。
+    """
+    if not getattr(sys, "frozen", False):
+        return str(Path(__file__).resolve().parent.parent / "cache")
+
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+            os.path.expanduser("~"), ".cache"
+        )
+    if not base or base.startswith("~"):
+        base = tempfile.gettempdir()
+    return os.path.join(base, APP_NAME, "cache")
+
+
 # --- 定数定義 ---
 SAVEFILE = "save.json"
+CACHE_DIR = _cache_dir()  # 実行時に生成するキャッシュの保存先
 DIALOGUES = "assets/dialogues/dialogues.json"
 
 
@@ -109,3 +143,173 @@ def resource_path(relative_path):
 
     # 相対パスを絶対パスに結合して返す
     return str(base_path / relative_path)
+
+
+_file_hashes = {}  # (パス, 更新日時, サイズ) -> ハッシュ値
+_file_hashes_lock = threading.Lock()
+
+
+def file_hash(path):
+    """
+    ファイル内容の SHA-1 ハッシュ値を返します。
+    同じプロセス内では (パス, 更新日時, サイズ) ごとに1回だけ計算します。
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    with _file_hashes_lock:
+        digest = _file_hashes.get(key)
+    if digest is not None:
+        return digest
+
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    with _file_hashes_lock:
+        _file_hashes[key] = digest
+    return digest
+
+
+@contextmanager
+def atomic_write(path, mode="wb", **kwargs):
+    """
+    一時ファイルに書き込み、閉じた後で path と置き換えます（書き込み途中のファイルを読ませない）。
+    with atomic_write(path) as f: の形で使い、例外が起きた場合は一時ファイルを削除します。
+    """
+    tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def surface_nbytes(surface):
+    """サーフェスが占有するピクセルメモリのバイト数を返します。"""
+    w, h = surface.get_size()
+    return w * h * surface.get_bytesize()
+
+
+class LRUCache:
+    """
+    容量（バイト数などの合計サイズ）に上限を持つ LRU キャッシュ。
+    上限を超えた場合は最も長く使われていない要素から破棄します。
+    ヒット数・ミス数・破棄数を記録し、stats() で参照できます。
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()  # key -> (value, size)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        """要素を取得し、最近使われたものとして扱います。"""
+        entry = self._items.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self._items.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, size=1):
+        """要素を登録し、上限を超えた分を古い順に破棄します。"""
+        if key in self._items:
+            self.total -= self._items.pop(key)[1]
+        self._items[key] = (value, size)
+        self.total += size
+
+        # 最新の要素は上限を超えていても残す（1要素が上限より大きい場合の保険）
+        while self.total > self.budget and len(self._items) > 1:
+            _, (_, old_size) = self._items.popitem(last=False)
+            self.total -= old_size
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        """要素を取り除いて返します。"""
+        entry = self._items.pop(key, None)
+        if entry is None:
+            return default
+        self.total -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        """全要素を破棄します（統計値は保持）。"""
+        self._items.clear()
+        self.total = 0
+
+    def stats(self):
+        """キャッシュの使用状況を辞書で返します。"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._items),
+            "bytes": self.total,
+            "budget": self.budget,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class QueueWorker:
+    """
+    依頼をキューに溜め、ワーカースレッドで1件ずつ handler に渡すクラス。
+    ワーカーは依頼が来たときに起動し、idle_timeout 秒間依頼がなければ終了します。
+    handler の例外は表示して握りつぶし、次の依頼の処理を続けます。
+    """
+
+    def __init__(self, handler, name, idle_timeout=1.0):
+        self.handler = handler
+        self.name = name  # エラー表示用の名前
+        self.idle_timeout = idle_timeout
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def put(self, items):
+        """依頼を追加し、ワーカーが止まっていれば起動します。"""
+        with self._lock:
+            for item in items:
+                self._queue.put(item)
+            if not self._queue.empty() and self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+
+    def clear(self):
+        """まだ処理していない依頼を破棄します（処理中の依頼はそのまま終わらせる）。"""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                # 追加の依頼がなければ終了（判定と登録をロックで直列化する）
+                with self._lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+
+            try:
+                self.handler(item)
+            except Exception as e:
+                print(f"{self.name}: Worker Error - {e}")
@@ -2,6 +2,8 @@ function build {
     git checkout main
     git pull
     # . .venv\Scripts\activate
+    python -m src.atlas
+    python -m src.core.script_bundle
     pyinstaller --onefile --windowed --add-data "assets;assets" src\main.py
     $dest = "..\for-win"
     if (-Not (Test-Path $dest)) {